@@ -1,3 +1,7 @@
-from .polish_product_search_agent import PolishProductSearchConfig, get_polish_product_search_agent
+from .polish_product_search_agent import (
+    PolishProductSearchConfig,
+    get_polish_product_search_agent,
+    get_polish_product_search_handoff,
+)
 
-__all__ = ["get_polish_product_search_agent", "PolishProductSearchConfig"]
+__all__ = ["get_polish_product_search_agent", "get_polish_product_search_handoff", "PolishProductSearchConfig"]
@@ -1,30 +1,31 @@
+import asyncio
+import dataclasses
+import functools
 from pathlib import Path
+from typing import Any, Final
 from zoneinfo import ZoneInfo
 
-from agents import Agent, WebSearchTool, function_tool, set_trace_processors
-from pydantic import BaseModel
+from agents import Agent, FunctionTool, ModelSettings, WebSearchTool, function_tool, set_trace_processors
+from agents.tool_context import ToolContext
+from pydantic import BaseModel, ConfigDict
 
 from telegram_bot.ai_assistant.agents.obsidian_agent import ObsidianAgentConfig, get_obsidian_agent
 from telegram_bot.ai_assistant.agents.polish_product_search_agent import (
     PolishProductSearchConfig,
-    get_polish_product_search_agent,
+    get_polish_product_search_handoff,
 )
 from telegram_bot.ai_assistant.local_trace_exporter import LocalFilesystemTracingProcessor
 from telegram_bot.ai_assistant.model_factory import ModelProvider
 from telegram_bot.ai_assistant.tools.applescript_tool import execute_applescript
 from telegram_bot.ai_assistant.tools.fetch_context_tool import create_fetch_context_tool
+from telegram_bot.service.ai_query_router import QueryRouterConfig
+from telegram_bot.service.ai_response_cache import AIResponseCacheConfig
 from telegram_bot.service.correlation_engine.models import CorrelationFetchConfig
 from telegram_bot.service.life_context.service import LifeContextService
 from telegram_bot.service.obsidian.obsidian_daily_notes_manager import ObsidianDailyNotesManager
 from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
 
-
-class AIAssistantConfig(BaseModel):
-    model_provider: ModelProvider = ModelProvider.OPENAI
-    model_name: str = "gpt-5"
-    relative_log_dir: str = "log/ai_assistant_traces.log"
-    semantic_search_enabled: bool = True
-    ai_assistant_instructions: str = """<rola>
+_AI_ASSISTANT_INSTRUCTIONS: Final[str] = """<rola>
     Jesteś osobistym asystentem AI zintegrowanym z systemem zarządzania wiedzą użytkownika. Twoim głównym zadaniem jest inteligentne rozpoznawanie intencji użytkownika i wykonywanie odpowiednich akcji: zapisywanie notatek, odpowiadanie na pytania, wyszukiwanie informacji lub analiza danych z Obsidian.
     </rola>
 
@@ -35,6 +36,8 @@ class AIAssistantConfig(BaseModel):
     4. **WebSearchTool** - przeszukuje internet dla aktualnych informacji
     5. **Handoff do ObsidianAgent** - deleguj zadania związane z analizą i przeszukiwaniem vaulta Obsidian
     6. **Handoff do PolishProductSearchAgent** - wyszukuje najlepsze oferty produktów w polskich sklepach internetowych
+
+    Jeśli odpowiedź wymaga kilku niezależnych narzędzi (np. `fetch_context` i WebSearchTool), wywołaj je równolegle w jednym kroku zamiast jedno po drugim.
     </dostępne_narzędzia>
 
     <kontakty_użytkownika>
@@ -212,11 +215,77 @@ class AIAssistantConfig(BaseModel):
 
     Pamiętaj: Twoim celem jest być niewidocznym ale skutecznym asystentem, który inteligentnie organizuje myśli użytkownika i pomaga w codziennych zadaniach.
     """  # noqa: E501
+
+
+class AIAssistantConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    model_provider: ModelProvider = ModelProvider.OPENAI
+    model_name: str = "gpt-5"
+    relative_log_dir: str = "log/ai_assistant_traces.log"
+    semantic_search_enabled: bool = True
+    ai_assistant_instructions: str = _AI_ASSISTANT_INSTRUCTIONS
     obsidian_agent: ObsidianAgentConfig = ObsidianAgentConfig()
     polish_product_search_agent: PolishProductSearchConfig = PolishProductSearchConfig()
     max_turns: int = 25
     last_n_messages: int = 5
     correlation_fetch: CorrelationFetchConfig = CorrelationFetchConfig()
+    response_cache: AIResponseCacheConfig = AIResponseCacheConfig()
+    query_router: QueryRouterConfig = QueryRouterConfig()
+
+
+# Tools whose invocation changes state outside the conversation; replies produced with them are never cached. The
+# function tools among them are serialized within a run by _serialize_tool. The filesystem MCP tools (write_file,
+# edit_file, move_file, create_directory) are invoked through the MCP server session and are not wrapped.
+SIDE_EFFECT_TOOLS = frozenset(
+    {"log_daily_note", "execute_applescript", "write_file", "edit_file", "move_file", "create_directory"}
+)
+
+_agent_cache: dict[tuple[Any, ...], Agent] = {}
+_agent_cache_lock = asyncio.Lock()
+
+
+@dataclasses.dataclass
+class AIAssistantRunContext:
+    """State shared by the tool calls of one assistant run; pass a fresh instance as the context of every run."""
+
+    side_effect_lock: asyncio.Lock = dataclasses.field(default_factory=asyncio.Lock)
+
+
+def _serialize_tool(tool: FunctionTool) -> FunctionTool:
+    """Make the tool wait for other side-effecting calls issued in the same run to finish first."""
+    invoke_tool = tool.on_invoke_tool
+
+    async def on_invoke_tool(ctx: ToolContext[AIAssistantRunContext], arguments: str) -> Any:
+        async with ctx.context.side_effect_lock:
+            return await invoke_tool(ctx, arguments)
+
+    return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+
+# function_tool introspects signatures and builds JSON schemas, so each tool is wrapped once per bound service
+@functools.cache
+def _daily_note_tool(obsidian_daily_notes_manager: ObsidianDailyNotesManager) -> FunctionTool:
+    return _serialize_tool(function_tool(obsidian_daily_notes_manager.log_daily_note))
+
+
+@functools.cache
+def _applescript_tool() -> FunctionTool:
+    return _serialize_tool(execute_applescript)
+
+
+@functools.cache
+def _fetch_context_tool(life_context_service: LifeContextService, tz: ZoneInfo) -> FunctionTool:
+    return create_fetch_context_tool(life_context_service, tz)
+
+
+@functools.cache
+def _configure_tracing(log_file_path: Path) -> str:
+    """Install the filesystem trace processor once per log file and return its resolved path."""
+    log_file_path.parent.mkdir(parents=True, exist_ok=True)
+    resolved_path = log_file_path.resolve().as_posix()
+    set_trace_processors([LocalFilesystemTracingProcessor(resolved_path)])
+    return resolved_path
 
 
 async def get_ai_assistant_agent(
@@ -227,25 +296,57 @@ async def get_ai_assistant_agent(
     tz: ZoneInfo,
     embedding_indexer: ObsidianEmbeddingIndexer,
 ) -> Agent:
-    log_file_path.parent.mkdir(parents=True, exist_ok=True)
-    set_trace_processors([LocalFilesystemTracingProcessor(log_file_path.resolve().as_posix())])
-
-    add_daily_note_tool = function_tool(obsidian_daily_notes_manager.log_daily_note)
-    fetch_context_tool = create_fetch_context_tool(life_context_service, tz)
+    """Return the AI assistant agent, building it only once per configuration and service set."""
+    cache_key = (
+        ai_assistant_config.model_dump_json(),
+        _configure_tracing(log_file_path),
+        tz.key,
+        obsidian_daily_notes_manager,
+        life_context_service,
+        embedding_indexer,
+    )
+    async with _agent_cache_lock:
+        agent = _agent_cache.get(cache_key)
+        if agent is None:
+            agent = await _build_ai_assistant_agent(
+                ai_assistant_config,
+                obsidian_daily_notes_manager,
+                life_context_service,
+                tz,
+                embedding_indexer,
+            )
+            _agent_cache[cache_key] = agent
+    return agent
+
+
+async def _build_ai_assistant_agent(
+    ai_assistant_config: AIAssistantConfig,
+    obsidian_daily_notes_manager: ObsidianDailyNotesManager,
+    life_context_service: LifeContextService,
+    tz: ZoneInfo,
+    embedding_indexer: ObsidianEmbeddingIndexer,
+) -> Agent:
     semantic_search_indexer = embedding_indexer if ai_assistant_config.semantic_search_enabled else None
 
     obsidian_agent = await get_obsidian_agent(
         ai_assistant_config.obsidian_agent,
         embedding_indexer=semantic_search_indexer,
     )
-    polish_product_search_agent = await get_polish_product_search_agent(ai_assistant_config.polish_product_search_agent)
+    polish_product_search_handoff = get_polish_product_search_handoff(ai_assistant_config.polish_product_search_agent)
 
-    tools = [add_daily_note_tool, execute_applescript, fetch_context_tool, WebSearchTool()]
+    # The SDK runs all tool calls of a turn concurrently; only the side-effecting ones are serialized.
+    tools = [
+        _daily_note_tool(obsidian_daily_notes_manager),
+        _applescript_tool(),
+        _fetch_context_tool(life_context_service, tz),
+        WebSearchTool(),
+    ]
 
     return Agent(
         name="AIAssistant",
         instructions=ai_assistant_config.ai_assistant_instructions,
         tools=tools,
-        handoffs=[obsidian_agent, polish_product_search_agent],
+        handoffs=[obsidian_agent, polish_product_search_handoff],
+        model_settings=ModelSettings(parallel_tool_calls=True),
         model=ai_assistant_config.model_name,
     )
@@ -1,10 +1,10 @@
 import asyncio
-import atexit
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Final
 
 from agents import Agent, ModelSettings
 from agents.mcp import MCPServerStdio
-from pydantic import BaseModel
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
 
 from telegram_bot.ai_assistant.model_factory import ModelFactory, ModelProvider
 from telegram_bot.ai_assistant.tools.semantic_search_tool import create_semantic_search_tool
@@ -13,22 +13,7 @@ if TYPE_CHECKING:  # pragma: no cover - import for typing only
     from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
 
 
-class ObsidianAgentConfig(BaseModel):
-    model_provider: ModelProvider = ModelProvider.OPENAI
-    model_name: str = "gpt-5"
-    obsidian_mcp_command: str = "docker"
-    obsidian_mcp_args: list[str] = [
-        "run",
-        "-i",
-        "-u",
-        "501:20",
-        "--rm",
-        "--mount",
-        "type=bind,src=/path/to/your/obsidian-vault," "dst=/projects/obsidian",
-        "mcp/filesystem",
-        "/projects",
-    ]
-    instructions: str = """<rola>
+_OBSIDIAN_INSTRUCTIONS: Final[str] = """<rola>
     Jesteś inteligentnym asystentem AI zintegrowanym z systemem Obsidian użytkownika. Twoim zadaniem jest pomaganie w wyszukiwaniu informacji, analizowaniu notatek i odpowiadaniu na pytania na podstawie zawartości vaulta.
     </rola>
 
@@ -51,19 +36,22 @@ class ObsidianAgentConfig(BaseModel):
     2. **read_file(path)** - czyta zawartość pliku
        Przykład: read_file(path="/projects/obsidian/01 management/10 process/0 daily/2024-06-02.md")
 
-    3. **write_file(path, content)** - tworzy nowy plik z zawartością
+    3. **read_multiple_files(paths)** - czyta kilka plików w jednym wywołaniu (szybsze niż kolejne `read_file`)
+       Przykład: read_multiple_files(paths=["/projects/obsidian/Projekty/Phoenix.md", "/projects/obsidian/01 management/10 process/0 daily/2024-06-02.md"])
+
+    4. **write_file(path, content)** - tworzy nowy plik z zawartością
        Przykład: write_file(path="/projects/obsidian/nowa_notatka.md", content="# Tytuł\nTreść")
 
-    4. **edit_file(path, edits)** - edytuje istniejący plik
+    5. **edit_file(path, edits)** - edytuje istniejący plik
        Przykład: edit_file(path="...", edits=[{"oldText": "stary tekst", "newText": "nowy tekst"}])
 
-    5. **list_directory(path)** - listuje zawartość katalogu
+    6. **list_directory(path)** - listuje zawartość katalogu
        Przykład: list_directory(path="/projects/obsidian/")
 
-    6. **search_files(query, path, pattern)** - przeszukuje pliki
+    7. **search_files(query, path, pattern)** - przeszukuje pliki
        Przykład: search_files(query="projekt Alpha", path="/projects/obsidian/")
 
-    7. **get_file_info(path)** - pobiera informacje o pliku (rozmiar, daty)
+    8. **get_file_info(path)** - pobiera informacje o pliku (rozmiar, daty)
     </dostępne_narzędzia>
 
     <praktyka_wyszukiwania_semantycznego>
@@ -80,12 +68,12 @@ class ObsidianAgentConfig(BaseModel):
     - "notatki o diecie ketogenicznej z 2024" -> semantic_search(query="dieta ketogeniczna")
     - semantic_search(query="ostatnie postępy w kursie hiszpańskiego", limit=3) -> semantic_search(query="kurs hiszpańskiego")
 
-    *Sekwencja pracy:* najpierw wykonaj `semantic_search`, wybierz najbardziej obiecujące wyniki, a następnie użyj `read_file()` aby potwierdzić kontekst, zacytować fragmenty i przygotować odpowiedź.
+    *Sekwencja pracy:* najpierw wykonaj `semantic_search`, wybierz najbardziej obiecujące wyniki, a następnie wczytaj je wszystkie jednym wywołaniem `read_multiple_files()` (lub `read_file()` dla pojedynczego pliku) aby potwierdzić kontekst, zacytować fragmenty i przygotować odpowiedź.
 
     *Unikaj:*
     - Bardzo krótkich zapytań bez kontekstu ("projekt", "notatka")
     - Łączenia wielu niezależnych tematów w jednej kwerendzie
-    - Pomijania `read_file()` po otrzymaniu wyników semantycznych – zawsze weryfikuj pełną treść
+    - Pomijania `read_multiple_files()` / `read_file()` po otrzymaniu wyników semantycznych – zawsze weryfikuj pełną treść
     </praktyka_wyszukiwania_semantycznego>
 
     <format_odpowiedzi>
@@ -100,7 +88,7 @@ class ObsidianAgentConfig(BaseModel):
     1. **Wyszukiwanie informacji:**
        - Najpierw określ, czego dokładnie szuka użytkownik
        - Użyj `semantic_search()` do szybkiego znalezienia najbardziej trafnych notatek
-       - Potwierdź wyniki z pomocą `read_file()` (lub `search_files()` dla prostych wyszukiwań tekstowych)
+       - Potwierdź wyniki z pomocą `read_multiple_files()` (lub `search_files()` dla prostych wyszukiwań tekstowych)
        - Analizuj zawartość i wyciągaj kluczowe informacje
 
     2. **Odpowiadanie na pytania:**
@@ -145,29 +133,72 @@ class ObsidianAgentConfig(BaseModel):
     """  # noqa: E501
 
 
+class ObsidianAgentConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    model_provider: ModelProvider = ModelProvider.OPENAI
+    model_name: str = "gpt-5"
+    obsidian_mcp_command: str = "docker"
+    obsidian_mcp_args: tuple[str, ...] = (
+        "run",
+        "-i",
+        "-u",
+        "501:20",
+        "--rm",
+        "--mount",
+        "type=bind,src=/path/to/your/obsidian-vault," "dst=/projects/obsidian",
+        "mcp/filesystem",
+        "/projects",
+    )
+    instructions: str = _OBSIDIAN_INSTRUCTIONS
+
+
+_agent_cache: dict[tuple[Any, ...], Agent] = {}
+_agent_cache_lock = asyncio.Lock()
+_mcp_servers: dict[tuple[str, tuple[str, ...]], MCPServerStdio] = {}
+
+
 async def get_obsidian_agent(
     agent_config: ObsidianAgentConfig,
     *,
     embedding_indexer: "ObsidianEmbeddingIndexer | None" = None,
 ) -> Agent:
-    obsidian_mcp_server = MCPServerStdio(
-        params={
-            "command": agent_config.obsidian_mcp_command,
-            "args": agent_config.obsidian_mcp_args,
-        },
-        cache_tools_list=True,
-    )
-    await obsidian_mcp_server.connect()
-
-    def cleanup_mcp_server():
-        """Synchronous wrapper for async cleanup."""
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            loop.create_task(obsidian_mcp_server.cleanup())
-        else:
-            asyncio.run(obsidian_mcp_server.cleanup())
-
-    atexit.register(cleanup_mcp_server)
+    """Return the Obsidian agent, building it only once per configuration and indexer."""
+    cache_key = (agent_config, embedding_indexer)
+    async with _agent_cache_lock:
+        agent = _agent_cache.get(cache_key)
+        if agent is None:
+            agent = await _build_obsidian_agent(agent_config, embedding_indexer)
+            _agent_cache[cache_key] = agent
+    return agent
+
+
+async def _get_mcp_server(agent_config: ObsidianAgentConfig) -> MCPServerStdio:
+    """Return the process-wide MCP server for the configured command, spawning it on first use.
+
+    MCP sessions multiplex requests by id, so every agent pointing at the same vault mount shares one process.
+    Must be called with ``_agent_cache_lock`` held.
+    """
+    server_key = (agent_config.obsidian_mcp_command, agent_config.obsidian_mcp_args)
+    server = _mcp_servers.get(server_key)
+    if server is None:
+        server = MCPServerStdio(
+            params={
+                "command": agent_config.obsidian_mcp_command,
+                "args": list(agent_config.obsidian_mcp_args),
+            },
+            cache_tools_list=True,
+        )
+        await server.connect()
+        _mcp_servers[server_key] = server
+    return server
+
+
+async def _build_obsidian_agent(
+    agent_config: ObsidianAgentConfig,
+    embedding_indexer: "ObsidianEmbeddingIndexer | None",
+) -> Agent:
+    obsidian_mcp_server = await _get_mcp_server(agent_config)
 
     tools = []
     if embedding_indexer is not None:
@@ -189,3 +220,17 @@ async def get_obsidian_agent(
         "Szczególnie przydatny do: przeszukiwania notatek dziennych, znajdowania informacji po"
         " tagach, analizy trendów i wzorców w notatkach, oraz odkrywania połączeń między różnymi obszarami wiedzy.",
     )
+
+
+async def cleanup_obsidian_mcp_servers() -> None:
+    """Shut down every MCP server spawned for Obsidian agents and forget the agents using them."""
+    async with _agent_cache_lock:
+        servers = list(_mcp_servers.values())
+        _mcp_servers.clear()
+        _agent_cache.clear()
+
+    for server in servers:
+        try:
+            await asyncio.shield(server.cleanup())
+        except Exception as exc:
+            logger.error(f"Failed to clean up Obsidian MCP server: {exc}")
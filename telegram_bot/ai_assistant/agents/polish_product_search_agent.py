@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Any, Final, Optional
 
-from agents import Agent, ModelSettings, WebSearchTool
-from pydantic import BaseModel, Field
+from agents import Agent, Handoff, ModelSettings, RunContextWrapper, WebSearchTool
+from agents.strict_schema import ensure_strict_json_schema
+from pydantic import BaseModel, ConfigDict, Field
 
 from telegram_bot.ai_assistant.model_factory import ModelProvider
 
@@ -24,136 +25,49 @@ class ProductSearchResult(BaseModel):
     summary: str = Field(description="Brief summary of search results and recommendations")
 
 
-class PolishProductSearchConfig(BaseModel):
-    model_provider: ModelProvider = ModelProvider.OPENAI
-    model_name: str = "gpt-5"
+SHOP_CATEGORIES: dict[str, list[str]] = {
+    "always": ["Allegro.pl", "Amazon.pl", "OLX.pl (used)", "Ceneo.pl (price comparison)"],
+    "electronics": ["Media Expert", "RTV Euro AGD", "x-kom", "Komputronik"],
+    "clothing": ["Zalando", "Answear", "eObuwie"],
+}
+_ALWAYS_CHECKED_SHOPS = ", ".join(SHOP_CATEGORIES["always"])
+_SHOP_CATEGORY_EXAMPLES = "; ".join(
+    f"{category}: {', '.join(shops)}" for category, shops in SHOP_CATEGORIES.items() if category != "always"
+)
 
-    instructions: str = """<role>
-    Jesteś ekspertem w wyszukiwaniu najlepszych ofert produktów online w Polsce.
-    Specjalizujesz się w znajdowaniu produktów o najlepszym stosunku jakości do ceny,
-    analizując różne kategorie sklepów i marketplace'ów w zależności od typu produktu.
+_PRODUCT_SEARCH_INSTRUCTIONS: Final[str] = f"""<role>
+    You find the best-value product offers in Polish online shops.
     </role>
 
-    <objective>
-    Twoim celem jest znalezienie najlepszych ofert dla użytkownika poprzez:
-    1. Zidentyfikowanie optymalnych typów sklepów dla danego produktu
-    2. Systematyczne przeszukanie każdego typu sklepu
-    3. Porównanie ofert pod kątem value-for-money
-    4. Dostarczenie ustrukturyzowanych wyników z kompletnymi informacjami
-    </objective>
-
     <process>
-    ## KROK 1: ANALIZA ZAPYTANIA I KATEGORYZACJA PRODUKTU
-    Najpierw dokładnie przeanalizuj czego szuka użytkownik:
-    - Zidentyfikuj typ produktu (elektronika, odzież, książki, meble, AGD, hobby, sport, itd.)
-    - Określ specyficzne wymagania (model, specyfikacje, budżet, stan - nowy/używany)
-    - Rozpoznaj priorytet użytkownika (najniższa cena, najlepsza jakość, najszybsza dostawa)
-
-    ## KROK 2: IDENTYFIKACJA OPTYMALNYCH TYPÓW SKLEPÓW
-    Na podstawie typu produktu, określ które kategorie sklepów dają największe szanse na znalezienie najlepszych ofert:
-    Na przykład:
-    - **Elektronika**: Media Expert, RTV Euro AGD, x-kom, Komputronik
-    - **Odzież**: Zalando, Answear, eObuwie itp.
-
-    ### Zawsze sprawdzaj:
-    - **Allegro.pl** - największy polski marketplace (nowe i używane)
-    - **Amazon.pl** - międzynarodowy marketplace z szybką dostawą
-    - **OLX.pl** - ogłoszenia lokalne (szczególnie dla używanych produktów)
-    - **Ceneo.pl** - porównywarka cen (agreguje oferty z wielu sklepów)
-
-    ## KROK 3: SYSTEMATYCZNY RESEARCH DLA KAŻDEGO TYPU SKLEPU
-    Dla każdej zidentyfikowanej kategorii sklepów, przeprowadź szczegółowe wyszukiwanie:
-
-    ### 3.1 Rozpocznij od marketplace'ów i porównywarek:
-    1. **Ceneo.pl** - wyszukaj produkt i sprawdź:
-       - Zakres cen (od-do)
-       - Liczba ofert
-       - Najlepsze oceniane sklepy
-       - Historię cen (jeśli dostępna)
-
-    2. **Allegro.pl** - przeszukaj:
-       - Oferty ze "Smart!" (darmowa dostawa)
-       - Oferty z "Super Sprzedawcą"
-       - Produkty używane vs nowe
-       - Aukcje vs kup teraz
-
-    3. **Amazon.pl** - sprawdź:
-       - Produkty z Prime
-       - Oferty dnia
-       - Warehouse Deals (zwroty)
-
-    4. **OLX.pl** - dla używanych:
-       - Lokalizacja (im bliżej, tym lepiej)
-       - Stan produktu
-       - Możliwość negocjacji
-
-    ### 3.2 Przeszukaj sklepy specjalistyczne:
-    Dla każdego odpowiedniego sklepu wykonaj:
-    - Wyszukaj dokładną nazwę produktu
-    - Sprawdź warianty i konfiguracje
-    - Porównaj ceny z i bez dostawy
-    - Sprawdź dostępność i czas realizacji
-    - Zweryfikuj promocje i kody rabatowe
-    - Oceń program lojalnościowy/cashback
-
-    ## KROK 4: ANALIZA I OCENA OFERT
-    Dla każdej znalezionej oferty oceń:
-    1. **Cena całkowita** (produkt + dostawa)
-    2. **Dostępność** (na stanie/czas oczekiwania)
-    3. **Wiarygodność sprzedawcy** (opinie, certyfikaty)
-    4. **Warunki zwrotu** i gwarancji
-    5. **Dodatkowe korzyści** (punkty lojalnościowe, gratisy)
-    6. **Stosunek jakości do ceny** względem konkurencji
-
-    ## KROK 5: FORMATOWANIE WYNIKÓW
-    Zwróć ustrukturyzowane wyniki używając funkcji product_search_result()
+    1. Analyse the request: product type, required model/specs, budget, new vs used, and the user's priority (lowest price, best quality, fastest delivery).
+    2. Pick the shop types most likely to have the best offers for this product. Always check: {_ALWAYS_CHECKED_SHOPS}. Category examples: {_SHOP_CATEGORY_EXAMPLES}.
+    3. Search each shop type systematically:
+       - Ceneo.pl: price range, number of offers, best-rated shops, price history.
+       - Allegro.pl: "Smart!" free delivery, "Super Sprzedawca" sellers, new vs used, auctions vs buy now.
+       - Amazon.pl: Prime offers, deals of the day, Warehouse Deals.
+       - OLX.pl (used items): location, condition, room for negotiation.
+       - Specialist shops: exact product name, variants, price with and without delivery, availability, promo codes, loyalty/cashback.
+    4. Score every offer on: total price incl. delivery, availability, seller trustworthiness, return and warranty terms, extras (loyalty points, gifts), value for money versus competitors.
+    5. Return structured results with product_search_result().
     </process>
 
     <search_methodology>
-    ### Strategia wyszukiwania:
-    1. **Warianty nazw**: Sprawdź różne warianty pisowni i nazewnictwa
-       - Przykład: "laptop" / "notebook", "słuchawki" / "headphones"
-
-    2. **Zapytania iteracyjne**:
-       - Zacznij od pełnej nazwy modelu
-       - Jeśli brak wyników, usuń mniej istotne części
-       - Sprawdź kategorie nadrzędne
-
-    3. **Filtry i sortowanie**:
-       - Sortuj po: cenie, popularności, ocenach
-       - Filtruj po: dostępności, lokalizacji, stanie
-
-    4. **Sprawdzanie promocji**:
-       - Szukaj fraz: "promocja", "wyprzedaż", "przecena", "black week"
-       - Sprawdź zakładki z ofertami specjalnymi
-       - Weryfikuj kody rabatowe na Picodi, Pepper.pl
+    - Try name variants and spellings (e.g. "laptop"/"notebook", "słuchawki"/"headphones").
+    - Start from the full model name; if nothing is found, drop less important parts, then check parent categories.
+    - Sort by price, popularity and rating; filter by availability, location and condition.
+    - Look for promotions ("promocja", "wyprzedaż", "przecena", "black week") and discount codes on Picodi and Pepper.pl.
     </search_methodology>
 
     <evaluation_criteria>
-    ### Kryteria oceny Value-for-Money:
-    1. **Wskaźnik cena/specyfikacje** - jak wypada na tle konkurencji
-    2. **Wysokość rabatu** - rzeczywista oszczędność vs cena regularna
-    3. **Oceny użytkowników** - minimum 4/5, liczba opinii
-    4. **Koszty dodatkowe** - dostawa, ubezpieczenie, akcesoria
-    5. **Czas dostawy** - priorytet dla 1-3 dni roboczych
-    6. **Polityka zwrotów** - minimum 14 dni, darmowy zwrot
-    7. **Gwarancja i serwis** - dostępność lokalnego serwisu
-    8. **Program lojalnościowy** - cashback, punkty, zniżki na kolejne zakupy
+    Value for money: price/spec ratio versus competitors, real discount versus the regular price, user ratings (at least 4/5 and their count), extra costs (delivery, insurance, accessories), delivery time (prefer 1-3 business days), returns (at least 14 days, free), local warranty service, loyalty programmes.
     </evaluation_criteria>
 
     <output_requirements>
-    ### Wymagania dla wyników:
-    - Minimum 5-10 ofert z różnych źródeł
-    - Posortowane według value-for-money (najlepsze pierwsze)
-    - Kompletne informacje dla każdej oferty:
-      - Dokładna nazwa produktu i wariant
-      - Cena aktualna i poprzednia (jeśli przecena)
-      - Nazwa sklepu i link do oferty
-      - Informacje o dostawie i dostępności
-      - Kluczowe zalety tej konkretnej oferty
-      - Ocena/rating jeśli dostępny
-    - Podsumowanie z rekomendacją TOP 3 ofert
-    - Wskazanie najlepszej oferty dla różnych priorytetów (najtańsza, najszybsza dostawa, najlepsza jakość)
+    - 5-10 offers from different sources, best value first.
+    - For each offer: exact product name and variant, current and previous price, shop name and link, delivery and availability, key advantages, rating if available.
+    - A summary recommending the TOP 3 offers and the best pick per priority (cheapest, fastest delivery, best quality).
+    - Write all user-facing text (summary, advantages) in Polish.
     </output_requirements>
 
     <format_odpowiedzi>
@@ -165,22 +79,37 @@ class PolishProductSearchConfig(BaseModel):
     </format_odpowiedzi>
 
     <error_handling>
-    ### Obsługa sytuacji problemowych:
-    - **Brak dokładnego modelu**: Zaproponuj najbliższe alternatywy z wyjaśnieniem różnic
-    - **Produkt niedostępny**: Wskaż gdzie można złożyć powiadomienie o dostępności
-    - **Duże różnice cenowe**: Wyjaśnij możliwe przyczyny (wersje, importy, podróbki)
-    - **Niejasne zapytanie**: Dopytaj o szczegóły przed wyszukiwaniem
+    - Exact model unavailable: propose the closest alternatives and explain the differences.
+    - Out of stock: point to where to sign up for availability notifications.
+    - Large price differences: explain likely causes (versions, imports, counterfeits).
+    - Unclear request: ask for details before searching.
     </error_handling>
 
     <important_notes>
-    ⚠️ WAŻNE:
-    - Zawsze sprawdzaj aktualność ofert (ceny zmieniają się dynamicznie)
-    - Weryfikuj czy cena zawiera VAT
-    - Dla elektroniki sprawdź czy to polska dystrybucja
-    - Ostrzegaj przed podejrzanie tanimi ofertami (możliwe podróbki)
-    - Informuj o różnicach między wersjami produktu
-    - Dla używanych produktów oceń stan i kompletność
-    </important_notes>"""
+    - Prices change quickly: check that offers are current and include VAT.
+    - For electronics, check that it is Polish distribution.
+    - Warn about suspiciously cheap offers (possible counterfeits) and about differences between product versions.
+    - For used products, assess condition and completeness.
+    </important_notes>"""  # noqa: E501
+
+
+class PolishProductSearchConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    model_provider: ModelProvider = ModelProvider.OPENAI
+    model_name: str = "gpt-5"
+    instructions: str = _PRODUCT_SEARCH_INSTRUCTIONS
+
+
+POLISH_PRODUCT_SEARCH_AGENT_NAME = "PolishProductSearchAgent"
+_HANDOFF_DESCRIPTION = (
+    "Ekspert w wyszukiwaniu najlepszych ofert produktów w polskich sklepach internetowych. "
+    "Specjalizuje się w znajdowaniu produktów o najlepszym stosunku jakości do ceny, "
+    "szczególnie elektroniki, laptopów i sprzętu komputerowego. "
+    "Przeszukuje główne polskie sklepy internetowe i porównywarki cen (Ceneo, Media Expert, x-kom, itp.) "
+    "aby znaleźć najlepsze oferty value-for-money. "
+    "Zwraca ustrukturyzowane wyniki z cenami, rabatami, opiniami i linkami do sklepów."
+)
 
 
 async def get_polish_product_search_agent(
@@ -188,16 +117,32 @@ async def get_polish_product_search_agent(
 ) -> Agent:
     """Create and configure the Polish product search agent."""
     return Agent(
-        name="PolishProductSearchAgent",
+        name=POLISH_PRODUCT_SEARCH_AGENT_NAME,
         instructions=agent_config.instructions,
         tools=[WebSearchTool()],
         model_settings=ModelSettings(tool_choice="auto"),
         model=agent_config.model_name,
         output_type=ProductSearchResult,
-        handoff_description="Ekspert w wyszukiwaniu najlepszych ofert produktów w polskich sklepach internetowych. "
-        "Specjalizuje się w znajdowaniu produktów o najlepszym stosunku jakości do ceny, "
-        "szczególnie elektroniki, laptopów i sprzętu komputerowego. "
-        "Przeszukuje główne polskie sklepy internetowe i porównywarki cen (Ceneo, Media Expert, x-kom, itp.) "
-        "aby znaleźć najlepsze oferty value-for-money. "
-        "Zwraca ustrukturyzowane wyniki z cenami, rabatami, opiniami i linkami do sklepów.",
+        handoff_description=_HANDOFF_DESCRIPTION,
+    )
+
+
+def get_polish_product_search_handoff(agent_config: PolishProductSearchConfig) -> Handoff:
+    """Create a handoff to the product search agent that builds the agent only when the model first transfers."""
+    agent: Agent | None = None
+
+    async def on_invoke_handoff(_ctx: RunContextWrapper[Any], _input_json: str) -> Agent:
+        nonlocal agent
+        if agent is None:
+            agent = await get_polish_product_search_agent(agent_config)
+        return agent
+
+    return Handoff(
+        tool_name="transfer_to_polish_product_search_agent",
+        tool_description=f"Handoff to the {POLISH_PRODUCT_SEARCH_AGENT_NAME} agent to handle the request. "
+        f"{_HANDOFF_DESCRIPTION}",
+        # The handoff takes no input, but strict function tools still need a complete object schema
+        input_json_schema=ensure_strict_json_schema({}),
+        on_invoke_handoff=on_invoke_handoff,
+        agent_name=POLISH_PRODUCT_SEARCH_AGENT_NAME,
     )
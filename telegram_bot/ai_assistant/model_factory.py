@@ -1,4 +1,5 @@
 import enum
+import functools
 import os
 from typing import Any, Optional
 
@@ -14,6 +15,12 @@ class ModelProvider(enum.Enum):
     OLLAMA = "ollama"
 
 
+@functools.cache
+def _shared_client(api_key: str, base_url: Optional[str]) -> AsyncOpenAI:
+    # One client, and so one HTTP connection pool, per endpoint and key for every agent in the process
+    return AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+
 class ModelFactory:
     """
     Factory class to build configurable AI model instances for different providers.
@@ -67,6 +74,7 @@ class ModelFactory:
                       for the provider (or none for standard OpenAI).
             client_kwargs: Additional keyword arguments to pass to the
                            AsyncOpenAI client constructor (e.g., timeout, max_retries).
+                           Without them, models for the same endpoint and key share one client.
 
         Returns:
             An instance of OpenAIChatCompletionsModel configured for the specified provider.
@@ -110,11 +118,14 @@ class ModelFactory:
         logger.debug(f"Client Kwargs: {client_args}")
         logger.debug("-" * (len(f"--- Building Model: {model_type.name} ---")))
 
-        client = AsyncOpenAI(
-            api_key=resolved_api_key,
-            base_url=resolved_base_url,
-            **client_args,
-        )
+        if client_args:
+            client = AsyncOpenAI(
+                api_key=resolved_api_key,
+                base_url=resolved_base_url,
+                **client_args,
+            )
+        else:
+            client = _shared_client(resolved_api_key, resolved_base_url)
         return OpenAIChatCompletionsModel(
             model=resolved_model_name,
             openai_client=client,
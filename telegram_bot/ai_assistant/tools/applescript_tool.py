@@ -1,13 +1,11 @@
-import os
-import subprocess
-import tempfile
+import asyncio
 from typing import Optional
 
 from agents import function_tool
 
 
 @function_tool
-def execute_applescript(code_snippet: str, timeout: Optional[int] = 60) -> str:
+async def execute_applescript(code_snippet: str, timeout: Optional[int] = 60) -> str:
     """
     Execute AppleScript code to interact with Mac applications and system features.
 
@@ -130,39 +128,39 @@ def execute_applescript(code_snippet: str, timeout: Optional[int] = 60) -> str:
     if not code_snippet or not code_snippet.strip():
         return "Error: code_snippet cannot be empty"
 
-    # Create temporary file for the AppleScript
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".scpt", delete=False, encoding="utf-8") as temp_file:
-        temp_path = temp_file.name
+    try:
+        # osascript reads the script from stdin when given "-", so the snippet never touches the disk
+        process = await asyncio.create_subprocess_exec(
+            "/usr/bin/osascript",
+            "-",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Python's own descriptors are non-inheritable, and without closing fds CPython can use posix_spawn
+            close_fds=False,
+        )
         try:
-            # Write the AppleScript to the temp file
-            temp_file.write(code_snippet)
-            temp_file.flush()
-
-            # Execute the AppleScript using osascript
-            cmd = ["/usr/bin/osascript", temp_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, encoding="utf-8")
-
-            if result.returncode != 0:
-                error_message = (
-                    f"AppleScript execution failed (return code {result.returncode}): {result.stderr.strip()}"
-                )
-                return error_message
-
-            # Return the output, or a success message if no output
-            output = result.stdout.strip()
-            return output if output else "AppleScript executed successfully (no output)"
-
-        except subprocess.TimeoutExpired:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(input=code_snippet.encode("utf-8")), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
             return f"AppleScript execution timed out after {timeout} seconds"
-        except FileNotFoundError:
-            return "Error: osascript command not found. This tool only works on macOS systems."
-        except PermissionError:
-            return "Error: Permission denied executing AppleScript. Check system permissions."
-        except Exception as e:
-            return f"Error executing AppleScript: {str(e)}"
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_path)
-            except OSError:
-                pass  # Ignore cleanup errors
+
+        if process.returncode != 0:
+            error_message = (
+                f"AppleScript execution failed (return code {process.returncode}): " f"{stderr.decode('utf-8').strip()}"
+            )
+            return error_message
+
+        # Return the output, or a success message if no output
+        output = stdout.decode("utf-8").strip()
+        return output if output else "AppleScript executed successfully (no output)"
+
+    except FileNotFoundError:
+        return "Error: osascript command not found. This tool only works on macOS systems."
+    except PermissionError:
+        return "Error: Permission denied executing AppleScript. Check system permissions."
+    except Exception as e:
+        return f"Error executing AppleScript: {str(e)}"
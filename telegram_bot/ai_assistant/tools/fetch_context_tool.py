@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -14,6 +14,10 @@ from agents import function_tool
 from telegram_bot.service.life_context.models import LifeContextMetric, LifeContextRequest
 from telegram_bot.service.life_context.service import LifeContextService
 
+_METRIC_BY_NAME: dict[str, LifeContextMetric] = {metric.value: metric for metric in LifeContextMetric}
+_VALID_METRICS = ", ".join(_METRIC_BY_NAME)
+_ALL_METRICS = frozenset(LifeContextMetric)
+
 
 def create_fetch_context_tool(life_context_service: LifeContextService, tz: ZoneInfo) -> FunctionTool:
     """Factory function to create a fetch_context tool with the life context service injected.
@@ -91,36 +95,32 @@ def create_fetch_context_tool(life_context_service: LifeContextService, tz: Zone
 
         if start_date is not None:
             try:
-                parsed_start = datetime.fromisoformat(start_date).date()
+                parsed_start = date.fromisoformat(start_date)
             except (ValueError, TypeError) as exc:
                 raise ValueError(f"Invalid start_date format. Expected YYYY-MM-DD, got: {start_date}") from exc
 
         if end_date is not None:
             try:
-                parsed_end = datetime.fromisoformat(end_date).date()
+                parsed_end = date.fromisoformat(end_date)
             except (ValueError, TypeError) as exc:
                 raise ValueError(f"Invalid end_date format. Expected YYYY-MM-DD, got: {end_date}") from exc
 
         # Parse metrics
-        requested_metrics: set[LifeContextMetric]
+        requested_metrics: frozenset[LifeContextMetric]
         if metrics == "all":
-            requested_metrics = set(LifeContextMetric)
+            requested_metrics = _ALL_METRICS
         elif isinstance(metrics, str):
             # Single metric provided as string
-            try:
-                requested_metrics = {LifeContextMetric(metrics)}
-            except ValueError as exc:
-                valid_values = [m.value for m in LifeContextMetric]
-                raise ValueError(f"Invalid metric '{metrics}'. Valid values: {', '.join(valid_values)}") from exc
+            metric = _METRIC_BY_NAME.get(metrics)
+            if metric is None:
+                raise ValueError(f"Invalid metric '{metrics}'. Valid values: {_VALID_METRICS}")
+            requested_metrics = frozenset((metric,))
         elif isinstance(metrics, list):
             # List of metrics provided
-            requested_metrics = set()
-            for metric_str in metrics:
-                try:
-                    requested_metrics.add(LifeContextMetric(metric_str))
-                except ValueError as exc:
-                    valid_values = [m.value for m in LifeContextMetric]
-                    raise ValueError(f"Invalid metric '{metric_str}'. Valid values: {', '.join(valid_values)}") from exc
+            try:
+                requested_metrics = frozenset(_METRIC_BY_NAME[metric_str] for metric_str in metrics)
+            except KeyError as exc:
+                raise ValueError(f"Invalid metric '{exc.args[0]}'. Valid values: {_VALID_METRICS}") from exc
         else:
             raise ValueError(f"metrics must be 'all', a string, or a list of strings. Got: {type(metrics)}")
 
@@ -128,7 +128,7 @@ def create_fetch_context_tool(life_context_service: LifeContextService, tz: Zone
         request = LifeContextRequest(
             start_date=parsed_start,
             end_date=parsed_end,
-            metrics=frozenset(requested_metrics),
+            metrics=requested_metrics,
         )
 
         # Fetch context
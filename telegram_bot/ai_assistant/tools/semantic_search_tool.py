@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 from agents import function_tool
 
 from telegram_bot.service.vector_store.protocols import VectorMatch
+from telegram_bot.utils import truncate_snippet
 
 if TYPE_CHECKING:
     from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
@@ -16,9 +17,7 @@ MAX_SNIPPET_LENGTH = 500
 def _format_match(match: VectorMatch) -> str:
     path = match.metadata.get("relative_path") if isinstance(match.metadata, dict) else None
     path = path or match.id
-    snippet = match.content.replace("\n", " ").strip()
-    if len(snippet) > MAX_SNIPPET_LENGTH:
-        snippet = snippet[: MAX_SNIPPET_LENGTH - 3].rstrip() + "…"
+    snippet = truncate_snippet(match.content, MAX_SNIPPET_LENGTH)
     return f"- {path} (distance: {match.score:.2f})\n  {snippet}"
 
 
@@ -40,9 +39,8 @@ def create_semantic_search_tool(indexer: "ObsidianEmbeddingIndexer"):
         matches = await indexer.semantic_search(query, limit=limit, path_filter=path_filter)
         if not matches:
             return "No matching notes found."
-        lines = ["*Semantic matches:*"]
-        lines.extend(_format_match(match) for match in matches)
-        return "\n".join(lines)
+        body = "\n".join(map(_format_match, matches))
+        return f"*Semantic matches:*\n{body}"
 
     tool = function_tool(_semantic_search)
     tool.python_callable = _semantic_search  # type: ignore[attr-defined]
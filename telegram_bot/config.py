@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Union
+from typing import Final, Union
 from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, Field
@@ -25,119 +25,7 @@ from telegram_bot.service.life_context import LifeContextConfig
 from telegram_bot.service.obsidian.obsidian_daily_notes_manager import ObsidianDailyNotesManagerConfig
 from telegram_bot.service.obsidian.obsidian_service import ObsidianConfig
 
-
-class CorrelationMetricConfig(BaseModel):
-    enabled: bool = True
-    threshold: MetricThreshold = Field(default_factory=MetricThreshold)
-
-
-class ChromaVectorStoreConfig(BaseModel):
-    enabled: bool = True
-    refresh_enabled: bool = True
-    collection_name: str = "obsidian-notes"
-    persist_relative_dir: Path = Path("chroma")
-    embedding_model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
-    embedding_batch_size: int = 64
-    chunk_size: int = 800
-    chunk_overlap: int = 200
-    refresh_cron: str = "0 3 * * *"
-    query_top_k: int = 5
-
-    def resolve_persist_path(self, out_dir: Path) -> Path:
-        persist_dir = Path(self.persist_relative_dir)
-        if persist_dir.is_absolute():
-            return persist_dir
-        return Path(out_dir) / persist_dir
-
-
-class CorrelationEngineConfig(BaseModel):
-    enabled: bool = True
-    cron: str = "0 2 * * *"
-    lookback_days: int = 1
-    timezone: str | None = None
-    window: WindowConfig = Field(default_factory=WindowConfig)
-    metrics: dict[BioSignalType, CorrelationMetricConfig] = Field(
-        default_factory=lambda: {
-            BioSignalType.STRESS: CorrelationMetricConfig(
-                threshold=MetricThreshold(min_delta=28.0, min_samples=10, min_confidence=0.95)
-            ),
-            BioSignalType.BODY_BATTERY: CorrelationMetricConfig(
-                threshold=MetricThreshold(min_delta=22.0, min_samples=10, min_confidence=0.95)
-            ),
-            BioSignalType.HEART_RATE: CorrelationMetricConfig(
-                threshold=MetricThreshold(min_delta=13.0, min_samples=10, min_confidence=0.95)
-            ),
-            BioSignalType.BREATHING_RATE: CorrelationMetricConfig(
-                threshold=MetricThreshold(min_delta=5.0, min_samples=10, min_confidence=0.95)
-            ),
-            BioSignalType.SLEEP: CorrelationMetricConfig(
-                threshold=MetricThreshold(min_delta=20.0, min_samples=3, min_confidence=0.9)
-            ),
-        }
-    )
-    sources: CorrelationSourcesConfig = Field(default_factory=CorrelationSourcesConfig)
-    sleep_analysis: SleepCorrelationConfig = Field(default_factory=SleepCorrelationConfig)
-    variance_analysis: ActivityImpactVarianceConfig = Field(default_factory=ActivityImpactVarianceConfig)
-
-    def to_job_config(self) -> CorrelationJobConfig:
-        enabled_metrics = {metric: cfg.threshold for metric, cfg in self.metrics.items() if cfg.enabled}
-        return CorrelationJobConfig(
-            lookback_days=self.lookback_days,
-            timezone=self.timezone or "UTC",
-            metrics=enabled_metrics,
-            windows=self.window.model_copy(deep=True),
-            sources=CorrelationSourcesConfig.model_validate(self.sources.model_dump()),
-            sleep_analysis=SleepCorrelationConfig.model_validate(self.sleep_analysis.model_dump()),
-            variance_analysis=ActivityImpactVarianceConfig.model_validate(self.variance_analysis.model_dump()),
-        )
-
-
-class WhisperSettings(BaseSettings):
-    model_size: str
-    device: str = "auto"
-    device_index: Union[int, list[int]] = 0
-    compute_type: str = "default"
-    cpu_threads: int = 0
-    num_workers: int = 1
-    download_root: Path = Path("./.cache/whisper")
-    local_files_only: bool = False
-
-
-class BotSettings(BaseSettings):
-    model_config = SettingsConfigDict(env_nested_delimiter="__")
-
-    telegram_bot_api_key: str
-    my_telegram_user_id: int
-    read_timeout_s: int = 30
-    write_timeout_s: int = 30
-    out_dir: Path = "./out"
-    garmin_token_dir: Path = "./out/garmin_tokens"
-    executor_num_async_workers: int = 4
-    executor_num_cpu_workers: int = 2
-    whisper: WhisperSettings
-    ai_assistant: AIAssistantConfig
-    life_context: LifeContextConfig = LifeContextConfig()
-    morning_report: MorningReportTaskConfig = MorningReportTaskConfig()
-    memory_consolidation: MemoryConsolidationTaskConfig = MemoryConsolidationTaskConfig()
-    log_analysis: LogAnalysisConfig = LogAnalysisConfig()
-    chroma_vector_store: ChromaVectorStoreConfig = Field(default_factory=ChromaVectorStoreConfig)
-    obsidian_config: ObsidianConfig = ObsidianConfig()
-    obsidian_daily_notes_manager_config: ObsidianDailyNotesManagerConfig = ObsidianDailyNotesManagerConfig()
-    calendar_config: CalendarConfig = CalendarConfig(
-        excluded_title_patterns=[
-            # Add your calendar event patterns to exclude here
-            # Example: r"Team Standup", r"1:1 Meeting"
-        ]
-    )
-    correlation_engine: CorrelationEngineConfig = CorrelationEngineConfig()
-
-    # Smart Context Triggers
-    context_trigger_task_config: dict[str, ContextTriggerConfig] = {
-        "30 8 * * *": ContextTriggerConfig(
-            name="Poranny Przegląd Dnia",
-            llm_config=DefaultLLMConfig.GEMINI_FLASH,
-            description="Ocena gotowości, wykrywanie symptomów choroby oraz dopasowanie planu dnia.",
-            prompt_template="""
+_MORNING_REVIEW_PROMPT: Final[str] = """
         Cel: ocenić gotowość do dnia i wykryć symptomy choroby, używając trendów i jakości danych.
         Wytyczne:
         - Porównaj sen i energię (Body Battery) do ostatnich ~3 dni (trendy, nie progi stałe).
@@ -146,14 +34,9 @@ class BotSettings(BaseSettings):
         - Jeśli są symptomy choroby lub wyraźnie niższa energia przy wymagającym dniu: zaproponuj wsparcie (np. przypomnienie o cynku i NAC dziś rano lub przy pierwszym oknie), oraz zachęć do zawężenia planu (priorytety, przełożenie drobnych rzeczy).
         - Jeśli energia/rutyna wyglądają dobrze i kalendarz jest lekki: zasugeruj, że to dobry moment na ważniejszą rzecz z listy priorytetów.
         - Komunikat zwięzły, wspierający, z konkretną propozycją działania (bez automatyzacji – tylko sugestia).
-        """,  # noqa: E501
-        ),
-        # CRON dla 13:00, codziennie
-        "0 13 * * *": ContextTriggerConfig(
-            name="Popołudniowy Reset Energii",
-            llm_config=DefaultLLMConfig.GEMINI_FLASH,
-            description="Analiza wzorców z ostatnich dni w celu rekomendacji spersonalizowanej mikro-przerwy.",
-            prompt_template="""
+        """  # noqa: E501
+
+_AFTERNOON_ENERGY_RESET_PROMPT: Final[str] = """
     Cel: Jesteś coachem specjalizującym się w zarządzaniu energią i prewencji wypalenia. Twoim zadaniem jest ocena bieżącego stanu (stres, energia) w kontekście ostatnich dni, aby zaproponować spersonalizowaną i kreatywną przerwę. Twoim priorytetem jest unikanie powtarzalnych, generycznych sugestii.
 
     <INSTRUKCJE_KROK_PO_KROKU>
@@ -182,15 +65,9 @@ class BotSettings(BaseSettings):
     </KROK_3_DECYZJA_I_SPERSONALIZOWANA_SUGESTIA>
 
     </INSTRUKCJE_KROK_PO_KROKU>
-    """,  # noqa: E501
-        ),
-        # CRON dla 19:00, codziennie  "0 19 * * *"
-        "0 19 * * *": ContextTriggerConfig(
-            name="Wieczorne Wyciszenie",
-            llm_config=DefaultLLMConfig.GEMINI_FLASH,
-            description="Analiza intensywności dnia i sugestia aktywności regeneracyjnej w "
-            "celu wyciszenia układu nerwowego.",
-            prompt_template="""
+    """  # noqa: E501
+
+_EVENING_WIND_DOWN_PROMPT: Final[str] = """
         Cel: Jesteś asystentem specjalizującym się w neurobiologii stresu i regeneracji. Twoim jedynym zadaniem jest ocena, czy dzisiejszy dzień był na tyle intensywny (fizycznie lub mentalnie), że uzasadnia to sugestię konkretnej aktywności pomagającej wyciszyć układ nerwowy. Aktywuj ten trigger TYLKO wtedy, gdy dane wyraźnie wskazują na podwyższony poziom stresu lub obciążenia.
 
         Zadania, których NIE wykonujesz:
@@ -228,16 +105,9 @@ class BotSettings(BaseSettings):
         - Bezpośrednio wskaż przyczynę (np. "Dzisiejszy wysoki poziom stresu...") i od razu podaj sugestię.
         - Przykład: "Zauważyłem, że dzisiejszy dzień, zwłaszcza popołudnie, był dość napięty. Aby pomóc układowi nerwowemu przejść w tryb regeneracji, rozważ krótki, 15-minutowy spacer w ciszy."
         </FORMAT_WIADOMOSCI>
-        """,  # noqa: E501
-        ),
-        # CRON dla 21:00, codziennie
-        "0 21 * * *": ContextTriggerConfig(
-            name="Konsolidacja Dnia",
-            llm_config=DefaultLLMConfig.GEMINI_FLASH,
-            description=(
-                "Pomaga w refleksji nad dniem, domknięciu otwartych pętli i strategicznym przygotowaniu na jutro."
-            ),
-            prompt_template="""
+        """  # noqa: E501
+
+_DAY_CONSOLIDATION_PROMPT: Final[str] = """
     Cel: Jesteś coachem i strategiem, który pomaga mi domknąć dzień i świadomie przygotować się na kolejny. Twoim zadaniem jest dostarczenie zwięzłego podsumowania, które pomoże mi w wieczornej refleksji, zidentyfikuje niedomknięte sprawy i wygeneruje konkretne, praktyczne alerty dotyczące jutrzejszego planu.
 
     <INSTRUKCJE_KROK_PO_KROKU>
@@ -267,10 +137,154 @@ class BotSettings(BaseSettings):
     </KROK_4_FORMULOWANIE_WIADOMOSCI>
 
     </INSTRUKCJE_KROK_PO_KROKU>
-    """,  # noqa: E501
+    """  # noqa: E501
+
+
+def _default_context_triggers() -> dict[str, ContextTriggerConfig]:
+    return {
+        "30 8 * * *": ContextTriggerConfig(
+            name="Poranny Przegląd Dnia",
+            llm_config=DefaultLLMConfig.gemini_flash(),
+            description="Ocena gotowości, wykrywanie symptomów choroby oraz dopasowanie planu dnia.",
+            prompt_template=_MORNING_REVIEW_PROMPT,
+        ),
+        # CRON dla 13:00, codziennie
+        "0 13 * * *": ContextTriggerConfig(
+            name="Popołudniowy Reset Energii",
+            llm_config=DefaultLLMConfig.gemini_flash(),
+            description="Analiza wzorców z ostatnich dni w celu rekomendacji spersonalizowanej mikro-przerwy.",
+            prompt_template=_AFTERNOON_ENERGY_RESET_PROMPT,
+        ),
+        # CRON dla 19:00, codziennie  "0 19 * * *"
+        "0 19 * * *": ContextTriggerConfig(
+            name="Wieczorne Wyciszenie",
+            llm_config=DefaultLLMConfig.gemini_flash(),
+            description="Analiza intensywności dnia i sugestia aktywności regeneracyjnej w "
+            "celu wyciszenia układu nerwowego.",
+            prompt_template=_EVENING_WIND_DOWN_PROMPT,
+        ),
+        # CRON dla 21:00, codziennie
+        "0 21 * * *": ContextTriggerConfig(
+            name="Konsolidacja Dnia",
+            llm_config=DefaultLLMConfig.gemini_flash(),
+            description=(
+                "Pomaga w refleksji nad dniem, domknięciu otwartych pętli i strategicznym przygotowaniu na jutro."
+            ),
+            prompt_template=_DAY_CONSOLIDATION_PROMPT,
         ),
     }
 
+
+class CorrelationMetricConfig(BaseModel):
+    enabled: bool = True
+    threshold: MetricThreshold = Field(default_factory=MetricThreshold)
+
+
+class ChromaVectorStoreConfig(BaseModel):
+    enabled: bool = True
+    refresh_enabled: bool = True
+    collection_name: str = "obsidian-notes"
+    persist_relative_dir: Path = Path("chroma")
+    embedding_model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    embedding_batch_size: int = 64
+    chunk_size: int = 800
+    chunk_overlap: int = 200
+    refresh_cron: str = "0 3 * * *"
+    query_top_k: int = 5
+
+    def resolve_persist_path(self, out_dir: Path) -> Path:
+        persist_dir = Path(self.persist_relative_dir)
+        if persist_dir.is_absolute():
+            return persist_dir
+        return Path(out_dir) / persist_dir
+
+
+class CorrelationEngineConfig(BaseModel):
+    enabled: bool = True
+    cron: str = "0 2 * * *"
+    lookback_days: int = 1
+    timezone: str | None = None
+    window: WindowConfig = Field(default_factory=WindowConfig)
+    metrics: dict[BioSignalType, CorrelationMetricConfig] = Field(
+        default_factory=lambda: {
+            BioSignalType.STRESS: CorrelationMetricConfig(
+                threshold=MetricThreshold(min_delta=28.0, min_samples=10, min_confidence=0.95)
+            ),
+            BioSignalType.BODY_BATTERY: CorrelationMetricConfig(
+                threshold=MetricThreshold(min_delta=22.0, min_samples=10, min_confidence=0.95)
+            ),
+            BioSignalType.HEART_RATE: CorrelationMetricConfig(
+                threshold=MetricThreshold(min_delta=13.0, min_samples=10, min_confidence=0.95)
+            ),
+            BioSignalType.BREATHING_RATE: CorrelationMetricConfig(
+                threshold=MetricThreshold(min_delta=5.0, min_samples=10, min_confidence=0.95)
+            ),
+            BioSignalType.SLEEP: CorrelationMetricConfig(
+                threshold=MetricThreshold(min_delta=20.0, min_samples=3, min_confidence=0.9)
+            ),
+        }
+    )
+    sources: CorrelationSourcesConfig = Field(default_factory=CorrelationSourcesConfig)
+    sleep_analysis: SleepCorrelationConfig = Field(default_factory=SleepCorrelationConfig)
+    variance_analysis: ActivityImpactVarianceConfig = Field(default_factory=ActivityImpactVarianceConfig)
+
+    def to_job_config(self) -> CorrelationJobConfig:
+        enabled_metrics = {metric: cfg.threshold for metric, cfg in self.metrics.items() if cfg.enabled}
+        return CorrelationJobConfig(
+            lookback_days=self.lookback_days,
+            timezone=self.timezone or "UTC",
+            metrics=enabled_metrics,
+            windows=self.window.model_copy(deep=True),
+            sources=self.sources.model_copy(deep=True),
+            sleep_analysis=self.sleep_analysis.model_copy(deep=True),
+            variance_analysis=self.variance_analysis.model_copy(deep=True),
+        )
+
+
+class WhisperSettings(BaseSettings):
+    model_size: str
+    device: str = "auto"
+    device_index: Union[int, list[int]] = 0
+    compute_type: str = "default"
+    cpu_threads: int = 0
+    num_workers: int = 1
+    download_root: Path = Path("./.cache/whisper")
+    local_files_only: bool = False
+
+
+class BotSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_nested_delimiter="__")
+
+    telegram_bot_api_key: str
+    my_telegram_user_id: int
+    read_timeout_s: int = 30
+    write_timeout_s: int = 30
+    out_dir: Path = "./out"
+    garmin_token_dir: Path = "./out/garmin_tokens"
+    executor_num_async_workers: int = 4
+    executor_num_cpu_workers: int = 2
+    whisper: WhisperSettings
+    ai_assistant: AIAssistantConfig
+    life_context: LifeContextConfig = LifeContextConfig()
+    morning_report: MorningReportTaskConfig = Field(default_factory=MorningReportTaskConfig)
+    memory_consolidation: MemoryConsolidationTaskConfig = Field(default_factory=MemoryConsolidationTaskConfig)
+    log_analysis: LogAnalysisConfig = LogAnalysisConfig()
+    chroma_vector_store: ChromaVectorStoreConfig = Field(default_factory=ChromaVectorStoreConfig)
+    obsidian_config: ObsidianConfig = ObsidianConfig()
+    obsidian_daily_notes_manager_config: ObsidianDailyNotesManagerConfig = Field(
+        default_factory=ObsidianDailyNotesManagerConfig
+    )
+    calendar_config: CalendarConfig = CalendarConfig(
+        excluded_title_patterns=[
+            # Add your calendar event patterns to exclude here
+            # Example: r"Team Standup", r"1:1 Meeting"
+        ]
+    )
+    correlation_engine: CorrelationEngineConfig = CorrelationEngineConfig()
+
+    # Smart Context Triggers
+    context_trigger_task_config: dict[str, ContextTriggerConfig] = Field(default_factory=_default_context_triggers)
+
     @property
     def tz(self) -> ZoneInfo:
-        return ZoneInfo(self.calendar_config.timezone)
+        return self.calendar_config.tz
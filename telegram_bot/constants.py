@@ -1,4 +1,4 @@
-from langchain_google_genai import HarmBlockThreshold, HarmCategory
+import functools
 
 from telegram_bot.service.llm_service import LLMConfig
 
@@ -6,53 +6,50 @@ MAX_TOKENS = 32_000  # Maximum number of tokens for LLMs in this bot
 DEFAULT_TIMEZONE = "Europe/Warsaw"
 
 
+@functools.cache
+def _gemini_safety_settings() -> dict:
+    """Return the shared safety settings for Gemini models, importing the google-genai stack on first use."""
+    from langchain_google_genai import HarmBlockThreshold, HarmCategory
+
+    return {
+        HarmCategory.HARM_CATEGORY_UNSPECIFIED: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DEROGATORY: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_TOXICITY: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_VIOLENCE: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUAL: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_MEDICAL: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_CIVIC_INTEGRITY: HarmBlockThreshold.BLOCK_NONE,
+    }
+
+
+def _gemini_llm_config(model: str) -> LLMConfig:
+    return LLMConfig(
+        llm_class_path="langchain_google_genai.ChatGoogleGenerativeAI",
+        llm_kwargs={"model": model, "max_tokens": MAX_TOKENS, "safety_settings": _gemini_safety_settings()},
+    )
+
+
 class DefaultLLMConfig:
     GPT_O_4_MINI = LLMConfig(
         llm_class_path="langchain_openai.ChatOpenAI", llm_kwargs={"model_name": "gpt-5", "max_tokens": MAX_TOKENS}
     )
-    GEMINI_PRO = LLMConfig(
-        llm_class_path="langchain_google_genai.ChatGoogleGenerativeAI",
-        llm_kwargs={
-            "model": "gemini-2.5-pro",
-            "max_tokens": MAX_TOKENS,
-            "safety_settings": {
-                HarmCategory.HARM_CATEGORY_UNSPECIFIED: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DEROGATORY: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_TOXICITY: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_VIOLENCE: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUAL: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_MEDICAL: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_CIVIC_INTEGRITY: HarmBlockThreshold.BLOCK_NONE,
-            },
-        },
-    )
-    GEMINI_FLASH = LLMConfig(
-        llm_class_path="langchain_google_genai.ChatGoogleGenerativeAI",
-        llm_kwargs={
-            "model": "gemini-2.5-flash",
-            "max_tokens": MAX_TOKENS,
-            "safety_settings": {
-                HarmCategory.HARM_CATEGORY_UNSPECIFIED: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DEROGATORY: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_TOXICITY: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_VIOLENCE: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUAL: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_MEDICAL: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_CIVIC_INTEGRITY: HarmBlockThreshold.BLOCK_NONE,
-            },
-        },
-    )
     CLAUDE_SONNET_4 = LLMConfig(
         llm_class_path="langchain_anthropic.ChatAnthropic",
         llm_kwargs={"model_name": "claude-sonnet-4-20250514", "max_tokens": MAX_TOKENS},
     )
+
+    # Gemini configs are built on first call, so importing this module doesn't pull in google-genai and grpc
+    @staticmethod
+    @functools.cache
+    def gemini_pro() -> LLMConfig:
+        return _gemini_llm_config("gemini-2.5-pro")
+
+    @staticmethod
+    @functools.cache
+    def gemini_flash() -> LLMConfig:
+        return _gemini_llm_config("gemini-2.5-flash")
@@ -4,7 +4,7 @@ from typing import Any
 
 from loguru import logger
 from telegram import Update
-from telegram.ext import CallbackContext
+from telegram.ext import CallbackContext, filters
 
 
 class PrivateHandler(ABC):
@@ -13,6 +13,8 @@ class PrivateHandler(ABC):
         if user_id is None:
             raise ValueError("MY_TELEGRAM_USER_ID is not set in .env file")
         self.user_id = int(user_id)
+        # Lets python-telegram-bot drop updates from other users before the callback is scheduled
+        self.user_filter = filters.User(user_id=self.user_id)
 
     async def handle(self, update: Update, context: CallbackContext) -> Any:
         logger.debug(
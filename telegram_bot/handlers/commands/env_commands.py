@@ -1,4 +1,10 @@
+import asyncio
 import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -8,6 +14,104 @@ from telegram.ext import CallbackContext, CommandHandler
 from telegram_bot.handlers.base.private_handler import PrivateHandler
 
 
+@dataclass(frozen=True)
+class EnvEntry:
+    line_num: int
+    key: str
+    value: str
+    # Offsets of the assignment line in the file content, excluding its newline
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class ParsedEnv:
+    content: str
+    entries: list[EnvEntry]
+    index: dict[str, int]
+
+
+# Characters a JSON document can start with; other values skip the json.loads attempt
+_JSON_START_CHARS = frozenset('{["-0123456789tfn')
+
+# A KEY=value line, with surrounding whitespace trimmed from the key and value; comment lines never match
+_ENV_ASSIGNMENT_PATTERN = re.compile(
+    r"^[^\S\n]*+(?!#)(?P<key>[^=\n]*?)[^\S\n]*=(?P<value>[^\n]*?)[^\S\n]*$", re.MULTILINE
+)
+
+# Parsed .env files keyed by path, each tagged with the (mtime_ns, size) it was parsed at
+_ENV_CACHE: dict[Path, tuple[int, int, ParsedEnv]] = {}
+
+
+def load_env(env_file: Path) -> ParsedEnv:
+    """Return the parsed .env file, re-reading it only when its mtime or size changed."""
+    stat = env_file.stat()
+    cached = _ENV_CACHE.get(env_file)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    with open(env_file, "r") as f:
+        parsed = _parse_env(f.read())
+    _ENV_CACHE[env_file] = (stat.st_mtime_ns, stat.st_size, parsed)
+    return parsed
+
+
+def _parse_env(content: str) -> ParsedEnv:
+    entries = []
+    index: dict[str, int] = {}
+    line_num = 1
+    scanned_up_to = 0
+    for match in _ENV_ASSIGNMENT_PATTERN.finditer(content):
+        line_num += content.count("\n", scanned_up_to, match.start())
+        scanned_up_to = match.start()
+        key = match["key"]
+        index.setdefault(key, len(entries))
+        entries.append(EnvEntry(line_num=line_num, key=key, value=match["value"], start=match.start(), end=match.end()))
+    return ParsedEnv(content=content, entries=entries, index=index)
+
+
+def write_env(env_file: Path, content: str) -> None:
+    """Replace the .env file with ``content`` and cache its parse, so the next read doesn't reopen the file."""
+    # Write a unique sibling of the real file and rename it over that file, so a crash never leaves .env half-written,
+    # concurrent writers don't share a temp file and a symlinked .env stays a symlink
+    target = env_file.resolve()
+    temp_fd, temp_path_str = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}_", suffix=".tmp")
+    temp_path = Path(temp_path_str)
+    try:
+        with os.fdopen(temp_fd, "w", encoding="utf-8") as temp_file:
+            temp_file.write(content)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        if target.exists():
+            shutil.copymode(target, temp_path)
+        os.replace(temp_path, target)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+    stat = env_file.stat()
+    _ENV_CACHE[env_file] = (stat.st_mtime_ns, stat.st_size, _parse_env(content))
+
+
+def set_env_var(env_file: Path, var_name: str, var_value: str) -> None:
+    """Set ``var_name`` in the .env file, replacing its first assignment line in place or appending a new one."""
+    content = ""
+    entry = None
+    if env_file.exists():
+        parsed_env = load_env(env_file)
+        content = parsed_env.content
+        entry_position = parsed_env.index.get(var_name)
+        if entry_position is not None:
+            entry = parsed_env.entries[entry_position]
+
+    assignment = f"{var_name}={var_value}"
+    if entry is not None:
+        content = f"{content[:entry.start]}{assignment}{content[entry.end:]}"
+    else:
+        separator = "\n" if content and not content.endswith("\n") else ""
+        content = f"{content}{separator}{assignment}\n"
+    write_env(env_file, content)
+
+
 class ListEnvHandler(PrivateHandler):
     async def _handle(self, update: Update, context: CallbackContext) -> Any:
         """List all environment variables from .env file."""
@@ -18,19 +122,10 @@ class ListEnvHandler(PrivateHandler):
             return
 
         try:
-            with open(env_file, "r") as f:
-                lines = f.readlines()
-
-            env_vars = []
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    if "=" in line:
-                        key = line.split("=", 1)[0]
-                        env_vars.append(f"{line_num}: {key}")
-
-            if env_vars:
-                message = "🔧 Environment variables:\n\n" + "\n".join(env_vars)
+            parsed_env = await asyncio.to_thread(load_env, env_file)
+            if parsed_env.entries:
+                env_vars = "\n".join(f"{entry.line_num}: {entry.key}" for entry in parsed_env.entries)
+                message = f"🔧 Environment variables:\n\n{env_vars}"
             else:
                 message = "📋 No environment variables found in .env file"
 
@@ -58,26 +153,22 @@ class ReadEnvHandler(PrivateHandler):
             return
 
         try:
-            with open(env_file, "r") as f:
-                lines = f.readlines()
-
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    if key.strip() == var_name:
-                        # Check if value is too long for a regular message
-                        if len(value) > 3500:  # Conservative limit
-                            await update.message.reply_text(
-                                f"⚠️ Value for `{var_name}` is too long for a message "
-                                f"({len(value)} characters).\n\n"
-                                f"💾 Use /read_env_file {var_name} to download as file."
-                            )
-                        else:
-                            await update.message.reply_text(f"🔍 {var_name}={value}")
-                        return
-
-            await update.message.reply_text(f"❌ Variable '{var_name}' not found in .env file")
+            parsed_env = await asyncio.to_thread(load_env, env_file)
+            entry_position = parsed_env.index.get(var_name)
+            if entry_position is None:
+                await update.message.reply_text(f"❌ Variable '{var_name}' not found in .env file")
+                return
+
+            value = parsed_env.entries[entry_position].value
+            # Check if value is too long for a regular message
+            if len(value) > 3500:  # Conservative limit
+                await update.message.reply_text(
+                    f"⚠️ Value for `{var_name}` is too long for a message "
+                    f"({len(value)} characters).\n\n"
+                    f"💾 Use /read_env_file {var_name} to download as file."
+                )
+            else:
+                await update.message.reply_text(f"🔍 {var_name}={value}")
 
         except Exception as e:
             await update.message.reply_text(f"❌ Error reading .env file: {str(e)}")
@@ -104,44 +195,20 @@ class SetEnvHandler(PrivateHandler):
             var_value = var_value[1:-1]
 
         # Handle JSON conversion if the value looks like a complex object
-        try:
-            # Try to parse as JSON first to validate
-            parsed_value = json.loads(var_value)
-            # Convert back to single-line JSON string
-            var_value = json.dumps(parsed_value)
-        except (json.JSONDecodeError, TypeError):
-            # Not JSON, use as-is
-            pass
+        if var_value.lstrip()[:1] in _JSON_START_CHARS:
+            try:
+                # Try to parse as JSON first to validate
+                parsed_value = json.loads(var_value)
+                # Convert back to single-line JSON string
+                var_value = json.dumps(parsed_value)
+            except (json.JSONDecodeError, TypeError):
+                # Not JSON, use as-is
+                pass
 
         env_file = Path(".env")
 
         try:
-            # Read existing lines
-            lines = []
-            if env_file.exists():
-                with open(env_file, "r") as f:
-                    lines = f.readlines()
-
-            # Look for existing variable and update it
-            found = False
-            for i, line in enumerate(lines):
-                line_stripped = line.strip()
-                if line_stripped and not line_stripped.startswith("#") and "=" in line_stripped:
-                    key = line_stripped.split("=", 1)[0].strip()
-                    if key == var_name:
-                        lines[i] = f"{var_name}={var_value}\n"
-                        found = True
-                        break
-
-            # If variable not found, append it
-            if not found:
-                if lines and not lines[-1].endswith("\n"):
-                    lines.append("\n")
-                lines.append(f"{var_name}={var_value}\n")
-
-            # Write back to file
-            with open(env_file, "w") as f:
-                f.writelines(lines)
+            await asyncio.to_thread(set_env_var, env_file, var_name, var_value)
 
             await update.message.reply_text(f"✅ Set {var_name}={var_value}")
 
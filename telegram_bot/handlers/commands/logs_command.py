@@ -1,4 +1,8 @@
-import tempfile
+import asyncio
+import functools
+import io
+import mmap
+import os
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +14,38 @@ from telegram.ext import CallbackContext, CommandHandler
 from telegram_bot.handlers.base.private_handler import PrivateHandler
 from telegram_bot.service.llm_service import LLMConfig, LLMService
 
+_MMAP_THRESHOLD = 1 << 20
+
+
+def _tail(path: Path, n: int) -> str:
+    """Return the last ``n`` lines of the file.
+
+    Small files are read whole; larger ones are memory-mapped so only the pages holding the tail are touched and the
+    newline scan runs directly over the page cache.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= _MMAP_THRESHOLD:
+            data = f.read()
+            return data[_last_lines_start(data, n) :].decode("utf-8", errors="replace")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[_last_lines_start(mm, n) :].decode("utf-8", errors="replace")
+
+
+def _last_lines_start(data: bytes | mmap.mmap, n: int) -> int:
+    """Return the offset where the last ``n`` lines of ``data`` begin, scanning backwards for newlines."""
+    end = len(data) - 1 if data[-1:] == b"\n" else len(data)
+    for _ in range(n):
+        end = data.rfind(b"\n", 0, end)
+        if end == -1:
+            return 0
+    return end + 1
+
+
+@functools.cache
+def _get_llm_service(llm_config_json: str) -> LLMService:
+    """Return one LLM service per distinct config, so rebuilt handlers reuse the same client and connection pool."""
+    return LLMService(LLMConfig.model_validate_json(llm_config_json))
+
 
 class LogAnalysisConfig(BaseModel):
     llm_config: LLMConfig = LLMConfig(
@@ -25,12 +61,20 @@ Log entries:
 {log_content}
 """
 
+    @functools.cached_property
+    def prompt_parts(self) -> tuple[str, str]:
+        """The analysis prompt split around ``{log_content}``, with brace escapes already resolved."""
+        prefix, _, suffix = self.log_analysis_prompt.partition("{log_content}")
+        return prefix.format(), suffix.format()
+
 
 class GetLogsHandler(PrivateHandler):
     def __init__(self, log_analysis_config: LogAnalysisConfig) -> None:
         super().__init__()
         self.log_analysis_config = log_analysis_config
-        self.llm_service = LLMService(log_analysis_config.llm_config)
+        self.llm_service = _get_llm_service(log_analysis_config.llm_config.model_dump_json())
+        # Length the prompt template adds around the log content
+        self._prompt_overhead = sum(map(len, log_analysis_config.prompt_parts))
 
     async def _handle(self, update: Update, context: CallbackContext) -> Any:
         """
@@ -60,34 +104,26 @@ class GetLogsHandler(PrivateHandler):
                 return
 
             # Read last N lines from the log file
-            with open(log_file_path, "r", encoding="utf-8") as f:
-                log_lines = f.readlines()
-                last_lines = log_lines[-lines:]
-                log_content = "".join(last_lines)
-
-            # Create temporary file with the logs
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False, encoding="utf-8") as temp_file:
-                temp_file.write(log_content)
-                temp_file_path = temp_file.name
-
-            # Send the log file
-            with open(temp_file_path, "rb") as log_file:
-                await update.message.reply_document(
-                    document=log_file, filename=f"last_{lines}_logs.log", caption=f"📋 Last {lines} log entries"
-                )
+            log_content = await asyncio.to_thread(_tail, log_file_path, lines)
 
-            # Clean up temporary file
-            Path(temp_file_path).unlink()
+            # Send the log snippet straight from memory
+            await update.message.reply_document(
+                document=io.BytesIO(log_content.encode("utf-8")),
+                filename=f"last_{lines}_logs.log",
+                caption=f"📋 Last {lines} log entries",
+            )
 
-            # Generate LLM analysis of the logs
-            analysis_prompt = self.log_analysis_config.log_analysis_prompt.format(log_content=log_content)
-
-            if len(analysis_prompt) >= 64_000:
+            # Reject oversized logs before formatting the prompt around them
+            if len(log_content) + self._prompt_overhead >= 64_000:
                 await update.message.reply_text(
                     "⚠️ Log content too large for analysis. Please reduce the number of lines."
                 )
                 return
 
+            # Generate LLM analysis of the logs
+            prompt_prefix, prompt_suffix = self.log_analysis_config.prompt_parts
+            analysis_prompt = f"{prompt_prefix}{log_content}{prompt_suffix}"
+
             try:
                 analysis = await self.llm_service.aprompt_llm(analysis_prompt)
                 await update.message.reply_text(f"🤖 **Log Analysis:**\n\n{analysis}")
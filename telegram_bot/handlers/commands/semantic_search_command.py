@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import functools
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
 from urllib.parse import quote
 
 from loguru import logger
@@ -9,70 +14,90 @@ from telegram.ext import CallbackContext, CommandHandler
 
 from telegram_bot.handlers.base.private_handler import PrivateHandler
 from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
-from telegram_bot.utils import escape_markdown_v1
+from telegram_bot.service.vector_store import VectorMatch
+from telegram_bot.utils import escape_markdown_v1, truncate_snippet
+
+
+@functools.lru_cache(maxsize=1024)
+def _obsidian_url(vault_name: str, relative_path: str) -> str:
+    """Generate Obsidian protocol URL for a given note path; notes that keep showing up in results are quoted once."""
+    return f"obsidian://open?vault={vault_name}&file={quote(relative_path, safe='')}"
+
+
+@dataclass(frozen=True)
+class _MatchDetails:
+    display_name: str
+    obsidian_url: str
+    snippet: str
+    score: float
 
 
 class SearchObsidianHandler(PrivateHandler):
-    def __init__(self, indexer: ObsidianEmbeddingIndexer, vault_name: str, max_snippet_length: int = 300) -> None:
+    def __init__(
+        self,
+        indexer: ObsidianEmbeddingIndexer,
+        vault_name: str,
+        max_snippet_length: int = 300,
+        cache_size: int = 64,
+        cache_ttl_seconds: float = 300.0,
+    ) -> None:
         super().__init__()
         self.indexer = indexer
         self.max_snippet_length = max_snippet_length
         self.vault_name = vault_name
-
-    def _format_obsidian_url(self, relative_path: str) -> str:
-        """Generate Obsidian protocol URL for a given note path."""
-        encoded_path = quote(relative_path, safe="")
-        return f"obsidian://open?vault={self.vault_name}&file={encoded_path}"
-
-    def _extract_match_details(self, match) -> tuple[str, str, str]:
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # Query -> (created_at, match details, markdown response), least recently used first
+        self._response_cache: OrderedDict[str, tuple[float, list[_MatchDetails], str]] = OrderedDict()
+
+    def _get_cached_response(self, query: str) -> tuple[list[_MatchDetails], str] | None:
+        cached = self._response_cache.get(query)
+        if cached is None:
+            return None
+        created_at, details, response_markdown = cached
+        if time.monotonic() - created_at > self.cache_ttl_seconds:
+            del self._response_cache[query]
+            return None
+        self._response_cache.move_to_end(query)
+        return details, response_markdown
+
+    def _cache_response(self, query: str, details: list[_MatchDetails], response_markdown: str) -> None:
+        self._response_cache[query] = (time.monotonic(), details, response_markdown)
+        self._response_cache.move_to_end(query)
+        while len(self._response_cache) > self.cache_size:
+            self._response_cache.popitem(last=False)
+
+    def _extract_match_details(self, match: VectorMatch) -> _MatchDetails:
         """Collect searchable metadata and a cleaned preview snippet."""
         path = match.metadata.get("relative_path") if isinstance(match.metadata, dict) else None
         path = path or match.id
 
         display_name = path[:-3] if path.endswith(".md") else path
-        obsidian_url = self._format_obsidian_url(path)
+        obsidian_url = _obsidian_url(self.vault_name, path)
 
         raw_content = getattr(match, "content", "") or ""
-        snippet = raw_content.replace("\n", " ").strip()
-        if len(snippet) > self.max_snippet_length:
-            snippet = snippet[: self.max_snippet_length - 3].rstrip() + "…"
-
-        return display_name, obsidian_url, snippet
-
-    def _format_match_markdown(self, match, index: int) -> str:
-        display_name, obsidian_url, snippet = self._extract_match_details(match)
-        safe_display = escape_markdown_v1(display_name)
-        safe_snippet = escape_markdown_v1(snippet) if snippet else ""
-
-        lines = [f"{index}. [{safe_display}]({obsidian_url})", f"   • Score: {match.score:.3f}"]
-        if safe_snippet:
-            lines.append(f"   • {safe_snippet}")
-        return "\n".join(lines)
-
-    def _format_match_plain(self, match, index: int) -> str:
-        display_name, obsidian_url, snippet = self._extract_match_details(match)
-        lines = [
-            f"{index}. {display_name}",
-            f"   • Score: {match.score:.3f}",
-            f"   • Open in Obsidian: {obsidian_url}",
-        ]
-        if snippet:
-            lines.append(f"   • {snippet}")
+        snippet = truncate_snippet(raw_content, self.max_snippet_length)
+
+        return _MatchDetails(display_name=display_name, obsidian_url=obsidian_url, snippet=snippet, score=match.score)
+
+    @staticmethod
+    def _build_markdown_response(query: str, details: Sequence[_MatchDetails]) -> str:
+        lines = ["🔍 *Search results*", f"• Query: {escape_markdown_v1(query)}"]
+        for index, match in enumerate(details, start=1):
+            lines.extend(("", f"{index}. [{escape_markdown_v1(match.display_name)}]({match.obsidian_url})"))
+            lines.append(f"   • Score: {match.score:.3f}")
+            if match.snippet:
+                lines.append(f"   • {escape_markdown_v1(match.snippet)}")
         return "\n".join(lines)
 
-    def _build_markdown_response(self, query: str, matches) -> str:
-        safe_query = escape_markdown_v1(query)
-        lines = ["🔍 *Search results*", f"• Query: {safe_query}"]
-        for idx, match in enumerate(matches, start=1):
-            lines.append("")
-            lines.append(self._format_match_markdown(match, idx))
-        return "\n".join(lines)
-
-    def _build_plain_response(self, query: str, matches) -> str:
+    @staticmethod
+    def _build_plain_response(query: str, details: Sequence[_MatchDetails]) -> str:
         lines = ["Search results", f"Query: {query}"]
-        for idx, match in enumerate(matches, start=1):
-            lines.append("")
-            lines.append(self._format_match_plain(match, idx))
+        for index, match in enumerate(details, start=1):
+            lines.extend(("", f"{index}. {match.display_name}", f"   • Score: {match.score:.3f}"))
+            lines.append(f"   • Open in Obsidian: {match.obsidian_url}")
+            if match.snippet:
+                lines.append(f"   • {match.snippet}")
         return "\n".join(lines)
 
     async def _handle(self, update: Update, context: CallbackContext) -> None:
@@ -87,9 +112,15 @@ class SearchObsidianHandler(PrivateHandler):
             )
             return
 
-        # Join all arguments to form the query
+        # Join all arguments to form the query, which also collapses any repeated whitespace
         query = " ".join(context.args)
 
+        # Repeated queries reuse the formatted response while the index is unlikely to have changed
+        cached = self._get_cached_response(query)
+        if cached is not None:
+            await self._send_results(update, query, *cached)
+            return
+
         # Show typing indicator while searching
         await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
 
@@ -130,7 +161,15 @@ class SearchObsidianHandler(PrivateHandler):
             return
 
         # Build response with clickable links
-        response_markdown = self._build_markdown_response(query, matches)
+        # Extract the details once, the plain text fallback reuses them
+        details = [self._extract_match_details(match) for match in matches]
+        response_markdown = self._build_markdown_response(query, details)
+        self._cache_response(query, details, response_markdown)
+        await self._send_results(update, query, details, response_markdown)
+
+    async def _send_results(
+        self, update: Update, query: str, details: Sequence[_MatchDetails], response_markdown: str
+    ) -> None:
         try:
             await update.message.reply_text(
                 response_markdown,
@@ -139,7 +178,7 @@ class SearchObsidianHandler(PrivateHandler):
             )
         except Exception as exc:  # pragma: no cover - network interaction
             logger.error("Failed to send markdown search results: %s", exc)
-            response_plain = self._build_plain_response(query, matches)
+            response_plain = self._build_plain_response(query, details)
             await update.message.reply_text(
                 response_plain,
                 disable_web_page_preview=True,
@@ -147,6 +186,11 @@ class SearchObsidianHandler(PrivateHandler):
 
 
 def get_search_obsidian_command(
-    indexer: ObsidianEmbeddingIndexer, vault_name: str, max_snippet_length: int = 300
+    indexer: ObsidianEmbeddingIndexer,
+    vault_name: str,
+    max_snippet_length: int = 300,
+    cache_size: int = 64,
+    cache_ttl_seconds: float = 300.0,
 ) -> CommandHandler:
-    return CommandHandler("search_obsidian", SearchObsidianHandler(indexer, vault_name, max_snippet_length).handle)
+    handler = SearchObsidianHandler(indexer, vault_name, max_snippet_length, cache_size, cache_ttl_seconds)
+    return CommandHandler("search_obsidian", handler.handle, filters=handler.user_filter)
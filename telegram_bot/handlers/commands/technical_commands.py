@@ -21,4 +21,5 @@ class BotRestartHandler(PrivateHandler):
 
 
 def get_restart_command() -> CommandHandler:
-    return CommandHandler("restart", BotRestartHandler().handle)
+    handler = BotRestartHandler()
+    return CommandHandler("restart", handler.handle, filters=handler.user_filter)
@@ -6,17 +6,20 @@ This module provides conversation handlers for reading and setting environment
 variables using file uploads/downloads when values are too long for regular messages.
 """
 
+import asyncio
 import io
-import json
+import tempfile
 from pathlib import Path
 from typing import Any
 
+import orjson
 from loguru import logger
 from telegram import Document, Update
 from telegram.constants import ParseMode
 from telegram.ext import CallbackContext, CommandHandler, ConversationHandler, MessageHandler, filters
 
 from telegram_bot.handlers.base.private_handler import PrivateHandler
+from telegram_bot.handlers.commands.env_commands import load_env, set_env_var
 
 # Conversation states
 WAITING_FOR_FILE = 1
@@ -25,6 +28,11 @@ WAITING_FOR_FILE = 1
 MAX_MESSAGE_LENGTH = 4000  # Conservative limit to account for formatting
 
 
+def _read_compact_json(path: Path) -> str:
+    """Validate the JSON file and return it re-serialized on a single line; orjson checks the UTF-8 itself."""
+    return orjson.dumps(orjson.loads(path.read_bytes())).decode("utf-8")
+
+
 class ReadEnvFileHandler(PrivateHandler):
     """Handler for reading environment variables and sending long values as files."""
 
@@ -42,34 +50,30 @@ class ReadEnvFileHandler(PrivateHandler):
             return
 
         try:
-            with open(env_file, "r") as f:
-                lines = f.readlines()
-
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    if key.strip() == var_name:
-                        # Check if value is too long for a regular message
-                        if len(value) > MAX_MESSAGE_LENGTH:
-                            # Send as file
-                            file_content = value.encode("utf-8")
-                            file_obj = io.BytesIO(file_content)
-                            file_obj.name = f"{var_name}.txt"
-
-                            await update.message.reply_document(
-                                document=file_obj,
-                                filename=f"{var_name}.txt",
-                                caption=f"📄 Value for environment variable `{var_name}`\n\n"
-                                f"💾 File size: {len(file_content)} bytes",
-                                parse_mode=ParseMode.MARKDOWN,
-                            )
-                        else:
-                            # Send as regular message
-                            await update.message.reply_text(f"🔍 {var_name}={value}")
-                        return
-
-            await update.message.reply_text(f"❌ Variable '{var_name}' not found in .env file")
+            parsed_env = await asyncio.to_thread(load_env, env_file)
+            entry_position = parsed_env.index.get(var_name)
+            if entry_position is None:
+                await update.message.reply_text(f"❌ Variable '{var_name}' not found in .env file")
+                return
+
+            value = parsed_env.entries[entry_position].value
+            # Check if value is too long for a regular message
+            if len(value) > MAX_MESSAGE_LENGTH:
+                # Send as file
+                file_content = value.encode("utf-8")
+                file_obj = io.BytesIO(file_content)
+                file_obj.name = f"{var_name}.txt"
+
+                await update.message.reply_document(
+                    document=file_obj,
+                    filename=f"{var_name}.txt",
+                    caption=f"📄 Value for environment variable `{var_name}`\n\n"
+                    f"💾 File size: {len(file_content)} bytes",
+                    parse_mode=ParseMode.MARKDOWN,
+                )
+            else:
+                # Send as regular message
+                await update.message.reply_text(f"🔍 {var_name}={value}")
 
         except Exception as e:
             logger.error(f"Error reading .env file: {e}")
@@ -123,56 +127,27 @@ class SetEnvFileReceiveHandler(PrivateHandler):
                 await update.message.reply_text("❌ File too large. Maximum size is 20MB.")
                 return WAITING_FOR_FILE
 
-            # Download the file
+            # Download the file to disk and decode it from there, so the raw bytes and the text
+            # are never held in memory at the same time
             file = await document.get_file()
-            file_content = await file.download_as_bytearray()
-
-            # Decode the content as text
-            try:
-                var_value = file_content.decode("utf-8").strip()
-            except UnicodeDecodeError:
-                await update.message.reply_text("❌ File must contain valid UTF-8 text.")
-                return WAITING_FOR_FILE
-
-            # Handle JSON formatting if the file appears to be JSON
-            if document.file_name and document.file_name.endswith(".json"):
-                try:
-                    # Validate and format JSON
-                    parsed_value = json.loads(var_value)
-                    var_value = json.dumps(parsed_value)
-                except json.JSONDecodeError as e:
-                    await update.message.reply_text(f"❌ Invalid JSON format: {str(e)}")
-                    return WAITING_FOR_FILE
+            with tempfile.TemporaryDirectory() as download_dir:
+                download_path = await file.download_to_drive(Path(download_dir) / "upload")
+                # Handle JSON formatting if the file appears to be JSON
+                if document.file_name and document.file_name.endswith(".json"):
+                    try:
+                        var_value = await asyncio.to_thread(_read_compact_json, download_path)
+                    except orjson.JSONDecodeError as e:
+                        await update.message.reply_text(f"❌ Invalid JSON format: {str(e)}")
+                        return WAITING_FOR_FILE
+                else:
+                    try:
+                        var_value = (await asyncio.to_thread(download_path.read_text, encoding="utf-8")).strip()
+                    except UnicodeDecodeError:
+                        await update.message.reply_text("❌ File must contain valid UTF-8 text.")
+                        return WAITING_FOR_FILE
 
             # Update the .env file
-            env_file = Path(".env")
-
-            # Read existing lines
-            lines = []
-            if env_file.exists():
-                with open(env_file, "r") as f:
-                    lines = f.readlines()
-
-            # Look for existing variable and update it
-            found = False
-            for i, line in enumerate(lines):
-                line_stripped = line.strip()
-                if line_stripped and not line_stripped.startswith("#") and "=" in line_stripped:
-                    key = line_stripped.split("=", 1)[0].strip()
-                    if key == var_name:
-                        lines[i] = f"{var_name}={var_value}\n"
-                        found = True
-                        break
-
-            # If variable not found, append it
-            if not found:
-                if lines and not lines[-1].endswith("\n"):
-                    lines.append("\n")
-                lines.append(f"{var_name}={var_value}\n")
-
-            # Write back to file
-            with open(env_file, "w") as f:
-                f.writelines(lines)
+            await asyncio.to_thread(set_env_var, Path(".env"), var_name, var_value)
 
             # Success message with summary
             value_preview = var_value[:100] + "..." if len(var_value) > 100 else var_value
@@ -210,7 +185,8 @@ class CancelHandler(PrivateHandler):
 
 def get_read_env_file_command() -> CommandHandler:
     """Returns a command handler for reading environment variables as files."""
-    return CommandHandler("read_env_file", ReadEnvFileHandler().handle)
+    handler = ReadEnvFileHandler()
+    return CommandHandler("read_env_file", handler.handle, filters=handler.user_filter)
 
 
 def get_set_env_file_handler() -> ConversationHandler:
@@ -220,7 +196,7 @@ def get_set_env_file_handler() -> ConversationHandler:
     cancel_handler = CancelHandler()
 
     return ConversationHandler(
-        entry_points=[CommandHandler("set_env_file", start_handler.handle)],
+        entry_points=[CommandHandler("set_env_file", start_handler.handle, filters=start_handler.user_filter)],
         states={
             WAITING_FOR_FILE: [
                 MessageHandler(filters.Document.ALL, receive_handler.handle),
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import json
-import tempfile
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime, timedelta
-from pathlib import Path
+from typing import IO, TextIO
 from zoneinfo import ZoneInfo
 
+import orjson
 from loguru import logger
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.constants import ParseMode
@@ -28,25 +30,74 @@ SELECT_METRICS, CUSTOM_METRICS, SELECT_PERIOD, CUSTOM_START, CUSTOM_END, SELECT_
 
 # Maximum date range allowed for exports (days)
 MAX_EXPORT_RANGE_DAYS = 120
-
-_METRIC_PRESETS: dict[str, Iterable[LifeContextMetric]] = {
-    "all": LifeContextMetric.all_metrics(),
-    "daily": (
-        LifeContextMetric.NOTES,
-        LifeContextMetric.GARMIN,
-        LifeContextMetric.CALENDAR,
-        LifeContextMetric.PERSISTENT_MEMORY,
+# Callback data prefixes; the conversation only routes callbacks starting with them to each step
+_METRICS_PREFIX = "metrics_"
+_PERIOD_PREFIX = "period_"
+_FORMAT_PREFIX = "format_"
+_PERIOD_DAYS: dict[str, int] = {"7": 7, "14": 14, "30": 30}
+
+_ALL_METRICS = LifeContextMetric.all_metrics()
+_ALL_METRIC_VALUES: tuple[str, ...] = tuple(sorted(metric.value for metric in _ALL_METRICS))
+_ALL_METRICS_TEXT = ", ".join(_ALL_METRIC_VALUES)
+
+_METRIC_PRESETS: dict[str, frozenset[LifeContextMetric]] = {
+    "all": _ALL_METRICS,
+    "daily": frozenset(
+        {
+            LifeContextMetric.NOTES,
+            LifeContextMetric.GARMIN,
+            LifeContextMetric.CALENDAR,
+            LifeContextMetric.PERSISTENT_MEMORY,
+        }
     ),
-    "notes": (
-        LifeContextMetric.NOTES,
-        LifeContextMetric.PERSISTENT_MEMORY,
+    "notes": frozenset(
+        {
+            LifeContextMetric.NOTES,
+            LifeContextMetric.PERSISTENT_MEMORY,
+        }
     ),
-    "insights": (
-        LifeContextMetric.GARMIN,
-        LifeContextMetric.CORRELATIONS,
-        LifeContextMetric.VARIANCE,
+    "insights": frozenset(
+        {
+            LifeContextMetric.GARMIN,
+            LifeContextMetric.CORRELATIONS,
+            LifeContextMetric.VARIANCE,
+        }
     ),
 }
+_METRICS_BY_NAME: dict[str, LifeContextMetric] = {metric.value: metric for metric in LifeContextMetric}
+_PRESET_LABELS: dict[str, str] = {
+    "all": "All metrics",
+    "daily": "Daily snapshot",
+    "notes": "Notes focus",
+    "insights": "Insights only",
+    "custom": "Custom selection",
+}
+
+# Keyboards are identical for every conversation, so they are built once
+_METRIC_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("✅ All metrics", callback_data="metrics_all")],
+        [InlineKeyboardButton("🗂 Daily snapshot", callback_data="metrics_daily")],
+        [InlineKeyboardButton("📝 Notes focus", callback_data="metrics_notes")],
+        [InlineKeyboardButton("📈 Insights only", callback_data="metrics_insights")],
+        [InlineKeyboardButton("🎛 Custom selection", callback_data="metrics_custom")],
+    ]
+)
+_PERIOD_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("Last 7 days", callback_data="period_7")],
+        [InlineKeyboardButton("Last 14 days", callback_data="period_14")],
+        [InlineKeyboardButton("Last 30 days", callback_data="period_30")],
+        [InlineKeyboardButton("This month", callback_data="period_month")],
+        [InlineKeyboardButton("Custom range", callback_data="period_custom")],
+    ]
+)
+_FORMAT_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("Markdown (.md)", callback_data="format_markdown")],
+        [InlineKeyboardButton("JSON (.json)", callback_data="format_json")],
+    ]
+)
 
 
 class LifeContextExportHandler(PrivateHandler):
@@ -64,7 +115,7 @@ class LifeContextExportHandler(PrivateHandler):
             "I'll prepare a downloadable report with your selected metrics.\n"
             "Default: *all metrics* for the last *7 days* as Markdown.\n"
             "Choose a quick preset or pick exactly what you need:",
-            reply_markup=self._metric_keyboard(),
+            reply_markup=_METRIC_KEYBOARD,
             parse_mode=ParseMode.MARKDOWN,
         )
         return SELECT_METRICS
@@ -72,22 +123,12 @@ class LifeContextExportHandler(PrivateHandler):
     def _initialise_defaults(self, context: CallbackContext) -> None:
         assert context.user_data is not None
         start, end = self._default_range()
-        context.user_data["metrics"] = set(LifeContextMetric.all_metrics())
+        context.user_data["metrics"] = _ALL_METRICS
         context.user_data["metrics_label"] = "All metrics"
         context.user_data["start_date"] = start
         context.user_data["end_date"] = end
         context.user_data["format"] = "markdown"
 
-    def _metric_keyboard(self) -> InlineKeyboardMarkup:
-        keyboard = [
-            [InlineKeyboardButton("✅ All metrics", callback_data="metrics_all")],
-            [InlineKeyboardButton("🗂 Daily snapshot", callback_data="metrics_daily")],
-            [InlineKeyboardButton("📝 Notes focus", callback_data="metrics_notes")],
-            [InlineKeyboardButton("📈 Insights only", callback_data="metrics_insights")],
-            [InlineKeyboardButton("🎛 Custom selection", callback_data="metrics_custom")],
-        ]
-        return InlineKeyboardMarkup(keyboard)
-
     async def select_metrics(self, update: Update, context: CallbackContext) -> int:
         assert update.callback_query is not None
         assert context.user_data is not None
@@ -95,7 +136,7 @@ class LifeContextExportHandler(PrivateHandler):
         assert query.data is not None
         await query.answer()
 
-        selection = query.data.replace("metrics_", "")
+        selection = query.data[len(_METRICS_PREFIX) :]
         if selection == "custom":
             await query.edit_message_text(
                 "Type the metrics you want separated by commas (e.g. `notes, garmin, calendar`).\n\n"
@@ -114,26 +155,16 @@ class LifeContextExportHandler(PrivateHandler):
 
         await query.edit_message_text(
             f"Great! We'll use *{context.user_data['metrics_label']}*." "\nNow pick a period:",
-            reply_markup=self._period_keyboard(),
+            reply_markup=_PERIOD_KEYBOARD,
             parse_mode=ParseMode.MARKDOWN,
         )
         return SELECT_PERIOD
 
-    def _resolve_preset(self, selection: str) -> set[LifeContextMetric] | None:
-        preset = _METRIC_PRESETS.get(selection)
-        if preset is None:
-            return None
-        return {metric if isinstance(metric, LifeContextMetric) else LifeContextMetric(metric) for metric in preset}
+    def _resolve_preset(self, selection: str) -> frozenset[LifeContextMetric] | None:
+        return _METRIC_PRESETS.get(selection)
 
     def _preset_label(self, selection: str) -> str:
-        labels = {
-            "all": "All metrics",
-            "daily": "Daily snapshot",
-            "notes": "Notes focus",
-            "insights": "Insights only",
-            "custom": "Custom selection",
-        }
-        return labels.get(selection, selection.capitalize())
+        return _PRESET_LABELS.get(selection, selection.capitalize())
 
     async def receive_custom_metrics(self, update: Update, context: CallbackContext) -> int:
         assert update.message is not None
@@ -148,42 +179,28 @@ class LifeContextExportHandler(PrivateHandler):
             return CUSTOM_METRICS
 
         context.user_data["metrics"] = choices
-        context.user_data["metrics_label"] = self._format_metric_list(sorted(m.value for m in choices))
+        context.user_data["metrics_label"] = self._describe_metrics(choices)[1]
 
-        await update.message.reply_text(
-            "Nice! Now choose the time period to export:", reply_markup=self._period_keyboard()
-        )
+        await update.message.reply_text("Nice! Now choose the time period to export:", reply_markup=_PERIOD_KEYBOARD)
         return SELECT_PERIOD
 
-    def _parse_metric_input(self, raw: str | None) -> set[LifeContextMetric] | None:
+    def _parse_metric_input(self, raw: str | None) -> frozenset[LifeContextMetric] | None:
         if not raw:
             return None
         cleaned = raw.strip().lower()
         if cleaned == "all":
-            return set(LifeContextMetric.all_metrics())
+            return _ALL_METRICS
 
-        separators = "," if "," in cleaned else None
-        parts = [part.strip() for part in cleaned.split(separators)] if separators else cleaned.split()
         metrics: set[LifeContextMetric] = set()
-        valid_names = {metric.value: metric for metric in LifeContextMetric}
-        for part in parts:
+        for part in cleaned.split(",") if "," in cleaned else cleaned.split():
+            part = part.strip()
             if not part:
                 continue
-            metric = valid_names.get(part)
+            metric = _METRICS_BY_NAME.get(part)
             if metric is None:
                 return None
             metrics.add(metric)
-        return metrics or None
-
-    def _period_keyboard(self) -> InlineKeyboardMarkup:
-        keyboard = [
-            [InlineKeyboardButton("Last 7 days", callback_data="period_7")],
-            [InlineKeyboardButton("Last 14 days", callback_data="period_14")],
-            [InlineKeyboardButton("Last 30 days", callback_data="period_30")],
-            [InlineKeyboardButton("This month", callback_data="period_month")],
-            [InlineKeyboardButton("Custom range", callback_data="period_custom")],
-        ]
-        return InlineKeyboardMarkup(keyboard)
+        return frozenset(metrics) or None
 
     async def select_period(self, update: Update, context: CallbackContext) -> int:
         assert update.callback_query is not None
@@ -192,7 +209,7 @@ class LifeContextExportHandler(PrivateHandler):
         assert query.data is not None
         await query.answer()
 
-        selection = query.data.replace("period_", "")
+        selection = query.data[len(_PERIOD_PREFIX) :]
         if selection == "custom":
             await query.edit_message_text(
                 "Send the start date (YYYY-MM-DD). You can also type `today` or `yesterday`.",
@@ -206,7 +223,7 @@ class LifeContextExportHandler(PrivateHandler):
 
         await query.edit_message_text(
             f"Period set to *{self._period_label(selection, start, end)}*.\nSelect export format:",
-            reply_markup=self._format_keyboard(),
+            reply_markup=_FORMAT_KEYBOARD,
             parse_mode=ParseMode.MARKDOWN,
         )
         return SELECT_FORMAT
@@ -216,9 +233,8 @@ class LifeContextExportHandler(PrivateHandler):
         if selection == "month":
             start = today.replace(day=1)
             return start, today
-        try:
-            days = int(selection)
-        except ValueError:
+        days = _PERIOD_DAYS.get(selection)
+        if days is None:
             logger.warning("Unknown period selection: %s", selection)
             return self._default_range()
         end = today
@@ -278,17 +294,10 @@ class LifeContextExportHandler(PrivateHandler):
         context.user_data["end_date"] = parsed
         await update.message.reply_text(
             f"We'll export from {start.isoformat()} to {parsed.isoformat()}. Choose the format:",
-            reply_markup=self._format_keyboard(),
+            reply_markup=_FORMAT_KEYBOARD,
         )
         return SELECT_FORMAT
 
-    def _format_keyboard(self) -> InlineKeyboardMarkup:
-        keyboard = [
-            [InlineKeyboardButton("Markdown (.md)", callback_data="format_markdown")],
-            [InlineKeyboardButton("JSON (.json)", callback_data="format_json")],
-        ]
-        return InlineKeyboardMarkup(keyboard)
-
     async def select_format(self, update: Update, context: CallbackContext) -> int:
         assert update.callback_query is not None
         assert context.user_data is not None
@@ -296,7 +305,7 @@ class LifeContextExportHandler(PrivateHandler):
         assert query.data is not None
         await query.answer()
 
-        selection = query.data.replace("format_", "")
+        selection = query.data[len(_FORMAT_PREFIX) :]
         context.user_data["format"] = selection
 
         await query.edit_message_text("Generating your export…")
@@ -307,15 +316,19 @@ class LifeContextExportHandler(PrivateHandler):
     async def _generate_and_send_export(self, update: Update, context: CallbackContext) -> None:
         assert update.effective_chat is not None
         assert context.user_data is not None
-        metrics: set[LifeContextMetric] = context.user_data.get("metrics", set(LifeContextMetric.all_metrics()))
-        start: date = context.user_data.get("start_date", self._default_range()[0])
-        end: date = context.user_data.get("end_date", self._default_range()[1])
+        metrics: frozenset[LifeContextMetric] = context.user_data.get("metrics", _ALL_METRICS)
+        start: date | None = context.user_data.get("start_date")
+        end: date | None = context.user_data.get("end_date")
+        if start is None or end is None:
+            default_start, default_end = self._default_range()
+            start = start or default_start
+            end = end or default_end
         export_format: str = context.user_data.get("format", "markdown")
 
         request = LifeContextRequest(
             start_date=start,
             end_date=end,
-            metrics=frozenset(metrics),
+            metrics=metrics,
         )
 
         try:
@@ -329,49 +342,38 @@ class LifeContextExportHandler(PrivateHandler):
             await self._notify_failure(update, context, f"⚠️ Export error: {response.error}")
             return
 
-        if export_format == "json":
-            content = self._build_json_payload(response, metrics)
-            suffix = ".json"
-        else:
-            content = self._build_markdown_document(response, metrics)
-            suffix = ".md"
+        metric_values, metrics_text = self._describe_metrics(metrics)
+        start_iso = start.isoformat()
+        end_iso = end.isoformat()
 
-        filename = self._build_filename(export_format, start, end)
-
-        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=suffix, delete=False) as tmp_file:
-            tmp_file.write(content)
-            temp_path = Path(tmp_file.name)
+        filename = self._build_filename(export_format, start_iso, end_iso)
+        export_file = await asyncio.to_thread(self._write_export, response, metric_values, metrics_text, export_format)
 
+        # The summary is the document's caption, so the export and its summary arrive in one message and a failed
+        # upload never reports a ready export
+        summary_markdown = self._export_summary(metrics_text, start_iso, end_iso, export_format, markdown_safe=True)
         try:
-            with temp_path.open("rb") as file:
+            await context.bot.send_document(
+                chat_id=update.effective_chat.id,
+                document=export_file,
+                filename=filename,
+                caption=summary_markdown,
+                parse_mode=ParseMode.MARKDOWN,
+            )
+        except Exception as exc:  # pragma: no cover - network interaction
+            logger.error("Failed to send life context export with markdown summary: %s", exc)
+            summary_plain = self._export_summary(metrics_text, start_iso, end_iso, export_format, markdown_safe=False)
+            export_file.seek(0)
+            try:
                 await context.bot.send_document(
                     chat_id=update.effective_chat.id,
-                    document=file,
+                    document=export_file,
                     filename=filename,
+                    caption=summary_plain,
                 )
-
-            summary_markdown = self._export_summary(metrics, start, end, export_format, markdown_safe=True)
-            try:
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=summary_markdown,
-                    parse_mode=ParseMode.MARKDOWN,
-                )
-            except Exception as exc:  # pragma: no cover - network interaction
-                logger.error("Failed to send markdown summary for life context export: %s", exc)
-                summary_plain = self._export_summary(metrics, start, end, export_format, markdown_safe=False)
-                try:
-                    await context.bot.send_message(
-                        chat_id=update.effective_chat.id,
-                        text=summary_plain,
-                    )
-                except Exception as fallback_exc:  # pragma: no cover - network interaction
-                    logger.exception("Failed to send plain text summary for life context export: %s", fallback_exc)
-        except Exception as exc:  # pragma: no cover - network interaction
-            logger.exception("Failed to send life context export: %s", exc)
-            await self._notify_failure(update, context, f"⚠️ Could not send export: {exc}")
-        finally:
-            temp_path.unlink(missing_ok=True)
+            except Exception as fallback_exc:  # pragma: no cover - network interaction
+                logger.error("Failed to send life context export: %s", fallback_exc)
+                await self._notify_failure(update, context, f"⚠️ Could not send export: {fallback_exc}")
 
     async def _notify_failure(self, update: Update, context: CallbackContext, message: str) -> None:
         if update.effective_message:
@@ -379,71 +381,94 @@ class LifeContextExportHandler(PrivateHandler):
         elif update.effective_chat:
             await context.bot.send_message(chat_id=update.effective_chat.id, text=message)
 
-    def _build_markdown_document(self, response: LifeContextFormattedResponse, metrics: set[LifeContextMetric]) -> str:
+    def _write_export(
+        self,
+        response: LifeContextFormattedResponse,
+        metric_values: tuple[str, ...],
+        metrics_text: str,
+        export_format: str,
+    ) -> io.BytesIO:
+        """Encode the export straight into the in-memory buffer that is uploaded."""
+        export_file = io.BytesIO()
+        if export_format == "json":
+            self._write_json_payload(export_file, response, metric_values)
+        else:
+            text_file = io.TextIOWrapper(export_file, encoding="utf-8")
+            self._write_markdown_document(text_file, response, metrics_text)
+            # Detaching flushes the text layer and leaves the buffer open for the upload
+            text_file.detach()
+        export_file.seek(0)
+        return export_file
+
+    def _write_markdown_document(self, file: TextIO, response: LifeContextFormattedResponse, metrics_text: str) -> None:
+        """Write the export one block at a time, ending the document with exactly one newline."""
+        # Trailing whitespace is held back until more content follows, so nothing dangles at the end of the file
+        pending = ""
+        for index, block in enumerate(self._markdown_blocks(response, metrics_text)):
+            text = f"{pending}\n{block}" if index else block
+            visible = text.rstrip()
+            if visible:
+                file.write(visible)
+            pending = text[len(visible) :]
+        file.write("\n")
+
+    def _markdown_blocks(self, response: LifeContextFormattedResponse, metrics_text: str) -> Iterator[str]:
         start = response.bundle.start_date.isoformat()
         end = response.bundle.end_date.isoformat()
-        header = [
-            "# Life Context Export",
-            f"- Date range: {start} → {end}",
-            f"- Metrics: {self._format_metric_list(sorted(metric.value for metric in metrics))}",
-            "",
-        ]
+        yield "# Life Context Export"
+        yield f"- Date range: {start} → {end}"
+        yield f"- Metrics: {metrics_text}"
+        yield ""
         if response.rendered_markdown:
-            body = [response.rendered_markdown]
-        else:
-            body = []
-            for metric_name, section in response.sections.items():
-                body.append(f"## {metric_name.replace('_', ' ').title()}")
-                markdown = section.get("markdown") if isinstance(section, dict) else None
-                if markdown:
-                    body.append(str(markdown))
-                else:
-                    data = section.get("data") if isinstance(section, dict) else None
-                    if data is not None:
-                        body.append("```json")
-                        body.append(json.dumps(data, indent=2, ensure_ascii=False))
-                        body.append("```")
-                body.append("")
-        return "\n".join(header + body).strip() + "\n"
-
-    def _build_json_payload(self, response: LifeContextFormattedResponse, metrics: set[LifeContextMetric]) -> str:
+            yield response.rendered_markdown
+            return
+        for metric_name, section in response.sections.items():
+            yield f"## {metric_name.replace('_', ' ').title()}"
+            markdown = section["markdown"]
+            if markdown:
+                yield str(markdown)
+            else:
+                data = section["data"]
+                if data is not None:
+                    yield "```json"
+                    yield json.dumps(data, indent=2, ensure_ascii=False)
+                    yield "```"
+            yield ""
+
+    def _write_json_payload(
+        self, file: IO[bytes], response: LifeContextFormattedResponse, metric_values: tuple[str, ...]
+    ) -> None:
         payload = {
             "date_range": {
                 "start_date": response.bundle.start_date.isoformat(),
                 "end_date": response.bundle.end_date.isoformat(),
             },
-            "selected_metrics": sorted(metric.value for metric in metrics),
+            "selected_metrics": metric_values,
             "sections": response.sections,
             "rendered_markdown": response.rendered_markdown,
             "error": response.error,
         }
-        return json.dumps(payload, indent=2, ensure_ascii=False)
+        file.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
-    def _build_filename(self, export_format: str, start: date, end: date) -> str:
-        base = f"life_context_{start.isoformat()}_{end.isoformat()}"
-        return base + (".json" if export_format == "json" else ".md")
+    def _build_filename(self, export_format: str, start_iso: str, end_iso: str) -> str:
+        suffix = ".json" if export_format == "json" else ".md"
+        return f"life_context_{start_iso}_{end_iso}{suffix}"
 
     def _export_summary(
         self,
-        metrics: set[LifeContextMetric],
-        start: date,
-        end: date,
+        metrics_text: str,
+        start_iso: str,
+        end_iso: str,
         export_format: str,
         *,
         markdown_safe: bool = True,
     ) -> str:
-        metric_text = self._format_metric_list(sorted(metric.value for metric in metrics))
-        if markdown_safe:
-            metric_text = escape_markdown_v1(metric_text)
-            start_text = escape_markdown_v1(start.isoformat())
-            end_text = escape_markdown_v1(end.isoformat())
-        else:
-            start_text = start.isoformat()
-            end_text = end.isoformat()
+        # ISO dates contain no Markdown special characters, only the metric names (e.g. persistent_memory) do
+        metric_text = escape_markdown_v1(metrics_text) if markdown_safe else metrics_text
         format_label = "Markdown" if export_format == "markdown" else "JSON"
         return (
             "✅ Export ready!\n"
-            f"• Range: {start_text} → {end_text}\n"
+            f"• Range: {start_iso} → {end_iso}\n"
             f"• Metrics: {metric_text}\n"
             f"• Format: {format_label}"
         )
@@ -451,15 +476,17 @@ class LifeContextExportHandler(PrivateHandler):
     def _parse_date_input(self, raw: str | None) -> date | None:
         if not raw:
             return None
-        text = raw.strip().lower()
-        if text == "today":
-            return self._today()
-        if text == "yesterday":
-            return self._today() - timedelta(days=1)
+        text = raw.strip()
         try:
             return date.fromisoformat(text)
         except ValueError:
-            return None
+            pass
+        keyword = text.lower()
+        if keyword == "today":
+            return self._today()
+        if keyword == "yesterday":
+            return self._today() - timedelta(days=1)
+        return None
 
     def _default_range(self) -> tuple[date, date]:
         end = self._today()
@@ -469,6 +496,13 @@ class LifeContextExportHandler(PrivateHandler):
     def _today(self) -> date:
         return datetime.now(self._tz).date()
 
+    def _describe_metrics(self, metrics: frozenset[LifeContextMetric]) -> tuple[tuple[str, ...], str]:
+        """Return the sorted metric names and their comma-separated label."""
+        if metrics == _ALL_METRICS:
+            return _ALL_METRIC_VALUES, _ALL_METRICS_TEXT
+        metric_values = tuple(sorted(metric.value for metric in metrics))
+        return metric_values, self._format_metric_list(metric_values)
+
     def _format_metric_list(self, metrics: Iterable[str]) -> str:
         return ", ".join(metrics)
 
@@ -485,12 +519,12 @@ def get_life_context_export_handler(life_context_service: LifeContextService, tz
     return ConversationHandler(
         entry_points=[CommandHandler("export_context", handler.handle)],
         states={
-            SELECT_METRICS: [CallbackQueryHandler(handler.select_metrics, pattern=r"^metrics_")],
+            SELECT_METRICS: [CallbackQueryHandler(handler.select_metrics, pattern=f"^{_METRICS_PREFIX}")],
             CUSTOM_METRICS: [MessageHandler(filters.TEXT & ~filters.COMMAND, handler.receive_custom_metrics)],
-            SELECT_PERIOD: [CallbackQueryHandler(handler.select_period, pattern=r"^period_")],
+            SELECT_PERIOD: [CallbackQueryHandler(handler.select_period, pattern=f"^{_PERIOD_PREFIX}")],
             CUSTOM_START: [MessageHandler(filters.TEXT & ~filters.COMMAND, handler.receive_custom_start)],
             CUSTOM_END: [MessageHandler(filters.TEXT & ~filters.COMMAND, handler.receive_custom_end)],
-            SELECT_FORMAT: [CallbackQueryHandler(handler.select_format, pattern=r"^format_")],
+            SELECT_FORMAT: [CallbackQueryHandler(handler.select_format, pattern=f"^{_FORMAT_PREFIX}")],
         },
         fallbacks=[CommandHandler("cancel", handler.cancel)],
         name="life_context_export",
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Final
 
 from loguru import logger
@@ -10,44 +12,70 @@ from telegram.ext import CallbackContext, CommandHandler, ConversationHandler, M
 from telegram_bot.handlers.base.private_handler import PrivateHandler
 from telegram_bot.service.scheduled_jobs_facade import ScheduledJobsFacade
 from telegram_bot.service.scheduled_task_service import ScheduledJobDescriptor
-from telegram_bot.utils import escape_markdown_v1
 
 SELECT_JOB, CONFIRM_RUN = range(2)
-JOB_MAPPING_KEY: Final[str] = "scheduled_jobs_mapping"
-SELECTED_JOB_KEY: Final[str] = "scheduled_selected_job"
+STATE_KEY: Final[str] = "scheduled_jobs_state"
 
 RUN_TILE = "🚀 Run now"
 BACK_TILE = "⬅️ Back"
 EXIT_TILE = "❌ Exit"
 
 
-def _build_keyboard_tiles(descriptors: list[ScheduledJobDescriptor]) -> list[list[str]]:
-    tiles: list[str] = []
-    for index, descriptor in enumerate(descriptors, start=1):
-        tiles.append(f"{index}. {descriptor.display_name}")
+_REMOVE_KEYBOARD = ReplyKeyboardRemove()
+_CONFIRM_KEYBOARD = ReplyKeyboardMarkup(
+    [[RUN_TILE], [BACK_TILE, EXIT_TILE]],
+    one_time_keyboard=False,
+    resize_keyboard=True,
+)
+
+
+@dataclass
+class _ScheduledJobsState:
+    """Per-conversation state kept under a single ``user_data`` key so cleanup is one pop."""
+
+    mapping: dict[str, str]
+    selected_job_id: str | None = None
+
+
+@dataclass(frozen=True)
+class _JobsMenu:
+    mapping: dict[str, str]
+    keyboard: ReplyKeyboardMarkup
+    text: str
 
+
+def _build_jobs_menu(descriptors: Sequence[ScheduledJobDescriptor]) -> _JobsMenu:
+    mapping: dict[str, str] = {}
     keyboard: list[list[str]] = []
-    row: list[str] = []
-    for tile in tiles:
-        row.append(tile)
-        if len(row) == 2:
-            keyboard.append(row)
-            row = []
-    if row:
-        keyboard.append(row)
+    tile_descriptions: list[str] = []
+    for index, descriptor in enumerate(descriptors, start=1):
+        tile = f"{index}. {descriptor.display_name}"
+        mapping[tile] = descriptor.job_id
+        # Two tiles per keyboard row
+        if index % 2:
+            keyboard.append([tile])
+        else:
+            keyboard[-1].append(tile)
+        tile_descriptions.append(f"{index}. *{descriptor.display_name}*\n   _{descriptor.schedule}_")
     keyboard.append([EXIT_TILE])
-    return keyboard
+
+    tiles_keyboard = ReplyKeyboardMarkup(
+        keyboard,
+        one_time_keyboard=False,
+        resize_keyboard=True,
+        input_field_placeholder="Select a job to inspect",
+    )
+    tiles_text = "\n".join(tile_descriptions)
+    text = (
+        "🗓️ *Scheduled Jobs*\n\nSelect a job tile below to view details and optionally run it now.\n\n" f"{tiles_text}"
+    )
+    return _JobsMenu(mapping=mapping, keyboard=tiles_keyboard, text=text)
 
 
 def _format_job_tile(descriptor: ScheduledJobDescriptor) -> str:
     description = descriptor.description or "No description provided."
-    metadata_lines = []
-    for key, value in descriptor.metadata.items():
-        metadata_lines.append(f"• *{key}*: `{value}`")
-    metadata_block = "\n".join(metadata_lines)
-    if metadata_block:
-        metadata_block = f"\n{metadata_block}"
-
+    # Each metadata line carries its own leading newline, so no metadata means no trailing separator
+    metadata_block = "".join(f"\n• *{key}*: `{value}`" for key, value in descriptor.metadata.items())
     return (
         f"*{descriptor.display_name}*\n"
         f"🕒 Schedule: `{descriptor.schedule}`\n"
@@ -60,40 +88,36 @@ class ScheduledJobsStartHandler(PrivateHandler):
     def __init__(self, facade: ScheduledJobsFacade) -> None:
         super().__init__()
         self._facade = facade
+        self._menu: _JobsMenu | None = None
+        self._menu_version: int | None = None
 
     async def _handle(self, update: Update, context: CallbackContext) -> int:
-        descriptors = list(self._facade.list_jobs())
-        if not descriptors:
+        menu = self._get_menu()
+        if menu is None:
             await update.message.reply_text(
-                "⚠️ No scheduled jobs are currently registered.", reply_markup=ReplyKeyboardRemove()
+                "⚠️ No scheduled jobs are currently registered.", reply_markup=_REMOVE_KEYBOARD
             )
             return ConversationHandler.END
 
-        context.user_data[JOB_MAPPING_KEY] = {
-            f"{index}. {descriptor.display_name}": descriptor.job_id
-            for index, descriptor in enumerate(descriptors, start=1)
-        }
-
-        tiles_keyboard = ReplyKeyboardMarkup(
-            _build_keyboard_tiles(descriptors),
-            one_time_keyboard=False,
-            resize_keyboard=True,
-            input_field_placeholder="Select a job to inspect",
-        )
-
-        tile_descriptions = [
-            f"{index}. *{descriptor.display_name}*\n   _{descriptor.schedule}_"
-            for index, descriptor in enumerate(descriptors, start=1)
-        ]
+        # The selection handler drops stale tiles from the mapping, so each conversation gets its own copy
+        context.user_data[STATE_KEY] = _ScheduledJobsState(mapping=dict(menu.mapping))
 
         await update.message.reply_text(
-            "🗓️ *Scheduled Jobs*\n\nSelect a job tile below to view details and optionally run it now.\n\n"
-            + "\n".join(tile_descriptions),
+            menu.text,
             parse_mode=ParseMode.MARKDOWN,
-            reply_markup=tiles_keyboard,
+            reply_markup=menu.keyboard,
         )
         return SELECT_JOB
 
+    def _get_menu(self) -> _JobsMenu | None:
+        """Return the rendered job menu, rebuilding it only after the registered jobs change."""
+        jobs_version = self._facade.jobs_version
+        if self._menu_version != jobs_version:
+            descriptors = self._facade.list_jobs()
+            self._menu = _build_jobs_menu(descriptors) if descriptors else None
+            self._menu_version = jobs_version
+        return self._menu
+
 
 class ScheduledJobsSelectionHandler(PrivateHandler):
     def __init__(self, facade: ScheduledJobsFacade) -> None:
@@ -102,12 +126,12 @@ class ScheduledJobsSelectionHandler(PrivateHandler):
 
     async def _handle(self, update: Update, context: CallbackContext) -> int:
         selection = update.message.text
-        mapping = context.user_data.get(JOB_MAPPING_KEY, {})
+        state: _ScheduledJobsState | None = context.user_data.get(STATE_KEY)
+        mapping = state.mapping if state is not None else {}
 
         if selection == EXIT_TILE:
-            await update.message.reply_text("✅ Exiting scheduled jobs menu.", reply_markup=ReplyKeyboardRemove())
-            context.user_data.pop(JOB_MAPPING_KEY, None)
-            context.user_data.pop(SELECTED_JOB_KEY, None)
+            await update.message.reply_text("✅ Exiting scheduled jobs menu.", reply_markup=_REMOVE_KEYBOARD)
+            context.user_data.pop(STATE_KEY, None)
             return ConversationHandler.END
 
         job_id = mapping.get(selection)
@@ -122,37 +146,31 @@ class ScheduledJobsSelectionHandler(PrivateHandler):
             mapping.pop(selection, None)
             return SELECT_JOB
 
-        context.user_data[SELECTED_JOB_KEY] = descriptor.job_id
-
-        confirm_keyboard = ReplyKeyboardMarkup(
-            [[RUN_TILE], [BACK_TILE, EXIT_TILE]],
-            one_time_keyboard=False,
-            resize_keyboard=True,
-        )
+        state.selected_job_id = descriptor.job_id
 
         await update.message.reply_text(
             _format_job_tile(descriptor),
             parse_mode=ParseMode.MARKDOWN,
-            reply_markup=confirm_keyboard,
+            reply_markup=_CONFIRM_KEYBOARD,
         )
         return CONFIRM_RUN
 
 
 class ScheduledJobsRunHandler(PrivateHandler):
-    def __init__(self, facade: ScheduledJobsFacade) -> None:
+    def __init__(self, facade: ScheduledJobsFacade, start_handler: ScheduledJobsStartHandler) -> None:
         super().__init__()
         self._facade = facade
+        self._start_handler = start_handler
 
     async def _handle(self, update: Update, context: CallbackContext) -> int:
         text = update.message.text
         if text == BACK_TILE:
             logger.debug("User requested to go back to scheduled jobs list.")
-            return await ScheduledJobsStartHandler(self._facade).handle(update, context)
+            return await self._start_handler.handle(update, context)
 
         if text == EXIT_TILE:
-            await update.message.reply_text("✅ Exiting scheduled jobs menu.", reply_markup=ReplyKeyboardRemove())
-            context.user_data.pop(JOB_MAPPING_KEY, None)
-            context.user_data.pop(SELECTED_JOB_KEY, None)
+            await update.message.reply_text("✅ Exiting scheduled jobs menu.", reply_markup=_REMOVE_KEYBOARD)
+            context.user_data.pop(STATE_KEY, None)
             return ConversationHandler.END
 
         if text != RUN_TILE:
@@ -161,57 +179,41 @@ class ScheduledJobsRunHandler(PrivateHandler):
             )
             return CONFIRM_RUN
 
-        job_id = context.user_data.get(SELECTED_JOB_KEY)
+        state: _ScheduledJobsState | None = context.user_data.get(STATE_KEY)
+        job_id = state.selected_job_id if state is not None else None
         if not job_id:
             await update.message.reply_text("⚠️ No job selected. Returning to job list.")
-            return await ScheduledJobsStartHandler(self._facade).handle(update, context)
+            return await self._start_handler.handle(update, context)
 
         outcome = await self._facade.run_job_now(job_id)
         status_icon = "✅" if outcome.success else "❌"
 
-        # Escape markdown special characters in dynamic content to prevent parsing errors
-        escaped_message = escape_markdown_v1(outcome.message)
-
-        try:
-            # Try sending with markdown first
-            await update.message.reply_text(
-                f"{status_icon} *{outcome.display_name}*\n\n{escaped_message}",
-                parse_mode=ParseMode.MARKDOWN,
-                reply_markup=ReplyKeyboardRemove(),
-            )
-        except Exception as e:
-            # If markdown fails, fall back to plain text to ensure user gets feedback
-            logger.error(f"Failed to send markdown message for job {job_id}: {e}. Falling back to plain text.")
-            try:
-                await update.message.reply_text(
-                    f"{status_icon} {outcome.display_name}\n\n{outcome.message}",
-                    reply_markup=ReplyKeyboardRemove(),
-                )
-            except Exception as e:
-                # Log if even plain text fails, but still cleanup state
-                logger.exception(f"Failed to send plain text message for job {job_id}: {e}")
-        finally:
-            # CRITICAL: Always cleanup conversation state, even if message sending fails
-            # This prevents the user from getting stuck in CONFIRM_RUN state
-            context.user_data.pop(JOB_MAPPING_KEY, None)
-            context.user_data.pop(SELECTED_JOB_KEY, None)
+        # Cleanup conversation state before replying so a failed send cannot leave the user stuck in CONFIRM_RUN
+        context.user_data.pop(STATE_KEY, None)
 
+        # Job output is arbitrary text, so it is sent as plain text that cannot fail Markdown parsing
+        await update.message.reply_text(
+            f"{status_icon} {outcome.display_name}\n\n{outcome.message}",
+            reply_markup=_REMOVE_KEYBOARD,
+        )
         return ConversationHandler.END
 
 
 async def cancel(update: Update, context: CallbackContext) -> int:
-    await update.message.reply_text("❌ Scheduled jobs conversation cancelled.", reply_markup=ReplyKeyboardRemove())
-    context.user_data.pop(JOB_MAPPING_KEY, None)
-    context.user_data.pop(SELECTED_JOB_KEY, None)
+    await update.message.reply_text("❌ Scheduled jobs conversation cancelled.", reply_markup=_REMOVE_KEYBOARD)
+    context.user_data.pop(STATE_KEY, None)
     return ConversationHandler.END
 
 
 def get_scheduled_jobs_handler(facade: ScheduledJobsFacade) -> ConversationHandler:
+    start_handler = ScheduledJobsStartHandler(facade)
     return ConversationHandler(
-        entry_points=[CommandHandler("scheduled_jobs", ScheduledJobsStartHandler(facade).handle)],
+        entry_points=[CommandHandler("scheduled_jobs", start_handler.handle)],
         states={
             SELECT_JOB: [MessageHandler(filters.TEXT & ~filters.COMMAND, ScheduledJobsSelectionHandler(facade).handle)],
-            CONFIRM_RUN: [MessageHandler(filters.TEXT & ~filters.COMMAND, ScheduledJobsRunHandler(facade).handle)],
+            CONFIRM_RUN: [
+                MessageHandler(filters.TEXT & ~filters.COMMAND, ScheduledJobsRunHandler(facade, start_handler).handle)
+            ],
         },
         fallbacks=[CommandHandler("cancel", cancel)],
     )
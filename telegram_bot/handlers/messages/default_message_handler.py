@@ -5,7 +5,7 @@ from telegram.ext import CallbackContext, MessageHandler, filters
 
 from telegram_bot.handlers.base.private_handler import PrivateHandler
 from telegram_bot.service.ai_assitant_service import AIAssistantService
-from telegram_bot.utils import send_message_chunks
+from telegram_bot.utils import StreamingReply
 
 
 class DefaultMessageHandler(PrivateHandler):
@@ -17,11 +17,16 @@ class DefaultMessageHandler(PrivateHandler):
         user_id = update.effective_user.id
         message_text = update.message.text
 
-        # Process the message with AI Assistant
-        response = await self.ai_assistant_service.run_ai_assistant(user_id=user_id, query=message_text)
-
-        # Send response using chunked message function
-        await send_message_chunks(context.bot, update.effective_chat.id, response)
+        # Process the message with AI Assistant, showing the reply while it is being generated
+        reply = await StreamingReply.start(context.bot, update.effective_chat.id)
+        try:
+            response = await self.ai_assistant_service.run_ai_assistant(
+                user_id=user_id, query=message_text, on_text_delta=reply.append
+            )
+        except Exception:
+            await reply.fail()
+            raise
+        await reply.finish(response)
 
 
 def get_default_message_handler(ai_assistant_service: AIAssistantService) -> MessageHandler:
@@ -1,3 +1,5 @@
+import asyncio
+import os
 import tempfile
 from pathlib import Path
 from typing import Any
@@ -12,7 +14,14 @@ from telegram_bot.service.ai_assitant_service import AIAssistantService
 from telegram_bot.service.background_task_executor import TaskResult
 from telegram_bot.service.db_service import MessageType
 from telegram_bot.service.message_transcription_service import MessageTranscriptionService, TranscriptionResult
-from telegram_bot.utils import send_message_chunks
+from telegram_bot.utils import StreamingReply
+
+
+def _create_temp_audio_path() -> Path:
+    """Create an empty temporary ``.ogg`` file for the download and return its path."""
+    fd, path = tempfile.mkstemp(suffix=".ogg")
+    os.close(fd)
+    return Path(path)
 
 
 class VoiceMessageHandler(PrivateHandler):
@@ -40,9 +49,9 @@ class VoiceMessageHandler(PrivateHandler):
         voice_file = await update.message.voice.get_file()
         user_id = update.effective_user.id
 
-        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp_file:
-            await voice_file.download_to_drive(custom_path=tmp_file.name)
-            temp_path = Path(tmp_file.name)
+        # Creating the file touches the disk, so it happens off the event loop; the download itself is async
+        temp_path = await asyncio.to_thread(_create_temp_audio_path)
+        await voice_file.download_to_drive(custom_path=temp_path)
 
         async def on_transcription_complete(task_result: TaskResult) -> None:
             temp_path.unlink(missing_ok=True)
@@ -55,19 +64,33 @@ class VoiceMessageHandler(PrivateHandler):
             transcript = " ".join([segment.text for segment in result.segments])
             transcription_time = round(result.duration.total_seconds(), 2)
 
-            # Send the transcription info
-            transcription_info = "🎙️ *Voice Message Transcript*\n\n"
-            transcription_info += f"_{transcript}_\n\n"
-            transcription_info += f"_(Transcribed in {transcription_time}s)_"
-            await update.message.reply_text(transcription_info, parse_mode=ParseMode.MARKDOWN)
-
-            # Process the transcript with AI Assistant
-            response = await self.ai_assistant_service.run_ai_assistant(
-                user_id=user_id, query=self._create_voice_context_prompt(transcript), message_type=MessageType.VOICE
+            transcription_info = (
+                f"🎙️ *Voice Message Transcript*\n\n_{transcript}_\n\n_(Transcribed in {transcription_time}s)_"
             )
 
-            # Send the AI response using chunked message function
-            await send_message_chunks(context.bot, update.effective_chat.id, response)
+            async def send_transcript_and_start_reply() -> StreamingReply:
+                await update.message.reply_text(transcription_info, parse_mode=ParseMode.MARKDOWN)
+                return await StreamingReply.start(context.bot, update.effective_chat.id)
+
+            # The transcript and the reply placeholder are sent in order while the AI call is already running
+            reply_task = asyncio.create_task(send_transcript_and_start_reply())
+
+            async def on_text_delta(delta: str) -> None:
+                await (await reply_task).append(delta)
+
+            try:
+                response = await self.ai_assistant_service.run_ai_assistant(
+                    user_id=user_id,
+                    query=self._create_voice_context_prompt(transcript),
+                    message_type=MessageType.VOICE,
+                    on_text_delta=on_text_delta,
+                    routing_text=transcript,
+                )
+            except Exception:
+                await (await reply_task).fail()
+                raise
+            reply = await reply_task
+            await reply.finish(response)
 
         await self.message_transcription_service.transcribe_message(
             tmp_audio_file=temp_path, callback=on_transcription_complete
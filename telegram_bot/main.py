@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import atexit
 from pathlib import Path
+from typing import Final
 
 from loguru import logger
 from telegram import (
     BotCommand,
+    BotCommandScope,
     BotCommandScopeAllGroupChats,
     BotCommandScopeAllPrivateChats,
     BotCommandScopeDefault,
@@ -14,6 +15,7 @@ from telegram import (
 )
 from telegram.ext import Application, ApplicationBuilder
 
+from telegram_bot.ai_assistant.agents.obsidian_agent import cleanup_obsidian_mcp_servers
 from telegram_bot.config import BotSettings
 from telegram_bot.handlers.commands.env_commands import get_list_env_command, get_read_env_command, get_set_env_command
 from telegram_bot.handlers.commands.garmin_commands import get_garmin_disconnect_command, get_garmin_status_command
@@ -55,85 +57,56 @@ def setup_logger(out_dir: Path) -> None:
     logger.info("logger initialised")
 
 
-def _build_commands() -> dict[str, list[BotCommand]]:
-    common = [
-        BotCommand("log_food", "Log your food consumption"),
-        BotCommand("list_food", "View your food logs"),
-        BotCommand("log_drug", "Log drug usage"),
-        BotCommand("list_drugs", "View your drug logs"),
-        BotCommand("search_obsidian", "Search Obsidian notes semantically"),
-        BotCommand("export_context", "Export life context summary"),
-        BotCommand("cancel", "Cancel current conversation"),
-    ]
-
-    garmin = [
-        BotCommand("connect_garmin", "Connect your Garmin account"),
-        BotCommand("garmin_export", "Export data from Garmin Connect"),
-        BotCommand("garmin_status", "Check Garmin Connect status"),
-        BotCommand("disconnect_garmin", "Disconnect your Garmin account"),
-    ]
-
-    technical = [
-        BotCommand("restart", "Restart the bot"),
-        BotCommand("get_logs", "Get last N log entries with AI analysis"),
-        BotCommand("list_env", "List all environment variables"),
-        BotCommand("read_env", "Read a specific environment variable"),
-        BotCommand("set_env", "Set an environment variable"),
-        BotCommand("read_env_file", "Read env variable as downloadable file"),
-        BotCommand("set_env_file", "Set env variable from uploaded file"),
-        BotCommand("scheduled_jobs", "List scheduled jobs and run one now"),
-    ]
-
-    return {
-        "default": common + garmin + technical,
-        "private": common + garmin + technical,
-        "group": common,
-    }
+_COMMON_COMMANDS: Final[tuple[BotCommand, ...]] = (
+    BotCommand("log_food", "Log your food consumption"),
+    BotCommand("list_food", "View your food logs"),
+    BotCommand("log_drug", "Log drug usage"),
+    BotCommand("list_drugs", "View your drug logs"),
+    BotCommand("search_obsidian", "Search Obsidian notes semantically"),
+    BotCommand("export_context", "Export life context summary"),
+    BotCommand("cancel", "Cancel current conversation"),
+)
+
+_GARMIN_COMMANDS: Final[tuple[BotCommand, ...]] = (
+    BotCommand("connect_garmin", "Connect your Garmin account"),
+    BotCommand("garmin_export", "Export data from Garmin Connect"),
+    BotCommand("garmin_status", "Check Garmin Connect status"),
+    BotCommand("disconnect_garmin", "Disconnect your Garmin account"),
+)
+
+_TECHNICAL_COMMANDS: Final[tuple[BotCommand, ...]] = (
+    BotCommand("restart", "Restart the bot"),
+    BotCommand("get_logs", "Get last N log entries with AI analysis"),
+    BotCommand("list_env", "List all environment variables"),
+    BotCommand("read_env", "Read a specific environment variable"),
+    BotCommand("set_env", "Set an environment variable"),
+    BotCommand("read_env_file", "Read env variable as downloadable file"),
+    BotCommand("set_env_file", "Set env variable from uploaded file"),
+    BotCommand("scheduled_jobs", "List scheduled jobs and run one now"),
+)
+
+_ALL_COMMANDS: Final[tuple[BotCommand, ...]] = _COMMON_COMMANDS + _GARMIN_COMMANDS + _TECHNICAL_COMMANDS
+
+# (commands, scope, language code) for every set_my_commands call made at startup
+_COMMAND_REGISTRATIONS: Final[tuple[tuple[tuple[BotCommand, ...], BotCommandScope, str | None], ...]] = (
+    (_ALL_COMMANDS, BotCommandScopeAllPrivateChats(), None),
+    (_COMMON_COMMANDS, BotCommandScopeAllGroupChats(), None),
+    (_ALL_COMMANDS, BotCommandScopeDefault(), None),
+    (_ALL_COMMANDS, BotCommandScopeDefault(), "en"),
+)
 
 
 async def _post_init(application: Application) -> None:
-    commands = _build_commands()
-
-    await SERVICE_FACTORY.background_task_executor.start_workers()
-    await register_scheduled_tasks(application)
-    await SERVICE_FACTORY.scheduled_task_service.start()
-
-    async def stop_all_services() -> None:
-        # Send shutdown message to the configured user
-        try:
-            await application.bot.send_message(  # noqa: F821
-                chat_id=BOT_SETTINGS.my_telegram_user_id, text="🤖 Bot is shutting down. All systems stopping."
-            )
-            logger.info(f"Shutdown message sent to user {BOT_SETTINGS.my_telegram_user_id}")
-        except Exception as e:
-            logger.error(f"Failed to send shutdown message: {e}")
-
-        await SERVICE_FACTORY.scheduled_task_service.stop()
-        await SERVICE_FACTORY.background_task_executor.stop_workers(False)
-
-    def shutdown_services():
-        """Synchronous wrapper for async shutdown."""
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            loop.create_task(stop_all_services())
-        else:
-            asyncio.run(stop_all_services())
-
-    atexit.register(shutdown_services)
-
-    matrix: list[tuple[list[BotCommand], object, str | None]] = [
-        (commands["private"], BotCommandScopeAllPrivateChats(), None),
-        (commands["group"], BotCommandScopeAllGroupChats(), None),
-        (commands["default"], BotCommandScopeDefault(), None),
-        (commands["default"], BotCommandScopeDefault(), "en"),
-    ]
-
-    await asyncio.gather(
-        *(
-            application.bot.set_my_commands(cmds, scope=scope, language_code=lang)  # noqa: F821
-            for cmds, scope, lang in matrix
-        )
-    )
+    async def start_scheduler() -> None:
+        await register_scheduled_tasks(application)
+        await SERVICE_FACTORY.scheduled_task_service.start()
+
+    # Workers, scheduled tasks and command registration are independent, so their startup round trips overlap
+    async with asyncio.TaskGroup() as task_group:
+        task_group.create_task(SERVICE_FACTORY.background_task_executor.start_workers())
+        task_group.create_task(start_scheduler())
+        for cmds, scope, lang in _COMMAND_REGISTRATIONS:
+            task_group.create_task(application.bot.set_my_commands(cmds, scope=scope, language_code=lang))  # noqa: F821
     logger.info("Bot commands registered.")
 
     # Send startup message to the configured user
@@ -146,6 +119,25 @@ async def _post_init(application: Application) -> None:
         logger.error(f"Failed to send startup message: {e}")
 
 
+async def _post_stop(application: Application) -> None:
+    # run_polling stops the application on SIGINT/SIGTERM; the bot can still send messages at this point
+    try:
+        await application.bot.send_message(  # noqa: F821
+            chat_id=BOT_SETTINGS.my_telegram_user_id, text="🤖 Bot is shutting down. All systems stopping."
+        )
+        logger.info(f"Shutdown message sent to user {BOT_SETTINGS.my_telegram_user_id}")
+    except Exception as e:
+        logger.error(f"Failed to send shutdown message: {e}")
+
+    await SERVICE_FACTORY.scheduled_task_service.stop()
+    await SERVICE_FACTORY.background_task_executor.stop_workers(False)
+
+
+async def _post_shutdown(application: Application) -> None:
+    await cleanup_obsidian_mcp_servers()
+    logger.info("Obsidian MCP servers stopped.")
+
+
 async def register_scheduled_tasks(application: Application) -> None:
     """Register scheduled tasks with the ScheduledTaskService."""
     scheduler = SERVICE_FACTORY.scheduled_task_service
@@ -246,6 +238,8 @@ def _build_app(bot_settings: BotSettings) -> Application:
         .read_timeout(bot_settings.read_timeout_s)
         .write_timeout(bot_settings.write_timeout_s)
         .post_init(_post_init)
+        .post_stop(_post_stop)
+        .post_shutdown(_post_shutdown)
         .build()
     )
     return application
@@ -84,8 +84,8 @@ class MemoryConsolidationTaskConfig(BaseModel):
     ai_logs_dir: str = "30 AI Assistant/memory/logs"
     daily_notes_dir: str = "01 management/10 process/0 daily"
 
-    summarization_llm_config: LLMConfig = DefaultLLMConfig.GEMINI_PRO
-    fact_extraction_llm_config: LLMConfig = DefaultLLMConfig.GEMINI_PRO
+    summarization_llm_config: LLMConfig = Field(default_factory=DefaultLLMConfig.gemini_pro)
+    fact_extraction_llm_config: LLMConfig = Field(default_factory=DefaultLLMConfig.gemini_pro)
 
     days_to_process_for_weekly: int = 7
 
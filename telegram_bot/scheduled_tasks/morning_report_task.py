@@ -13,7 +13,7 @@ from typing import TYPE_CHECKING, Any
 from zoneinfo import ZoneInfo
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from telegram import Bot
 
 from telegram_bot.constants import DEFAULT_TIMEZONE, DefaultLLMConfig
@@ -41,7 +41,7 @@ class MorningReportTaskConfig(BaseModel):
     calendar_lookahead_days: int = 2
     correlation_fetch: CorrelationFetchConfig = CorrelationFetchConfig()
 
-    summarizing_llm_config: LLMConfig = DefaultLLMConfig.GEMINI_PRO
+    summarizing_llm_config: LLMConfig = Field(default_factory=DefaultLLMConfig.gemini_pro)
 
 
 def _generate_morning_report(
@@ -1,11 +1,33 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
 from datetime import datetime
 from typing import Any
 
-from agents import Agent, Runner
+import numpy as np
+from agents import (
+    Agent,
+    AgentUpdatedStreamEvent,
+    MaxTurnsExceeded,
+    RawResponsesStreamEvent,
+    RunItem,
+    Runner,
+    ToolCallItem,
+)
+from agents.result import RunResultBase
 from loguru import logger
+from openai.types.responses import ResponseTextDeltaEvent
 
-from telegram_bot.ai_assistant.agents.ai_assitant_agent import get_ai_assistant_agent
+from telegram_bot.ai_assistant.agents import get_polish_product_search_agent
+from telegram_bot.ai_assistant.agents.ai_assitant_agent import (
+    SIDE_EFFECT_TOOLS,
+    AIAssistantRunContext,
+    get_ai_assistant_agent,
+)
+from telegram_bot.ai_assistant.agents.obsidian_agent import get_obsidian_agent
 from telegram_bot.config import BotSettings
+from telegram_bot.service.ai_query_router import QueryKind, QueryRouter
+from telegram_bot.service.ai_response_cache import AIResponseCache
 from telegram_bot.service.db_service import DBService, MessageEntry, MessageType
 from telegram_bot.service.life_context.service import LifeContextService
 from telegram_bot.service.obsidian.obsidian_daily_notes_manager import ObsidianDailyNotesManager
@@ -21,6 +43,9 @@ class AIAssistantService:
         obsidian_daily_notes_manager: ObsidianDailyNotesManager,
         life_context_service: LifeContextService,
         obsidian_embedding_indexer: ObsidianEmbeddingIndexer,
+        embedding_function: Callable[[Sequence[str]], Sequence[Sequence[float]]],
+        response_cache: AIResponseCache | None = None,
+        query_router: QueryRouter | None = None,
     ) -> None:
         self.db_service = db_service
         self.bot_settings = bot_settings
@@ -28,9 +53,58 @@ class AIAssistantService:
         self.obsidian_daily_notes_manager = obsidian_daily_notes_manager
         self.life_context_service = life_context_service
         self.obsidian_embedding_indexer = obsidian_embedding_indexer
+        self.embedding_function = embedding_function
+        self.response_cache = response_cache
+        self.query_router = query_router
+        self._direct_agents: dict[QueryKind, Agent[Any]] = {}
 
-    async def run_ai_assistant(self, user_id: int, query: str, message_type: MessageType = MessageType.TEXT) -> str:
-        if self.ai_assistant_agent is None:
+    async def run_ai_assistant(
+        self,
+        user_id: int,
+        query: str,
+        message_type: MessageType = MessageType.TEXT,
+        on_text_delta: Callable[[str], Awaitable[None]] | None = None,
+        routing_text: str | None = None,
+    ) -> str:
+        """Answer the query, optionally streaming text deltas of the reply to ``on_text_delta`` as they arrive.
+
+        ``routing_text`` is the user's own message when ``query`` wraps it in extra instructions for the model; it is
+        what gets embedded for routing and caching. Defaults to ``query``.
+        """
+        if routing_text is None:
+            routing_text = query
+        bypass_cache = AIResponseCache.is_bypassed(routing_text)
+        if bypass_cache:
+            query = AIResponseCache.strip_bypass_tag(query)
+            routing_text = AIResponseCache.strip_bypass_tag(routing_text)
+        today = datetime.now().date()
+
+        max_turns = self.bot_settings.ai_assistant.max_turns
+        starting_agent: Agent[Any] | None = None
+        cache: AIResponseCache | None = None
+        query_embedding: np.ndarray | None = None
+        if self.query_router is not None:
+            query_embedding = await self._embed_query(routing_text)
+            route = await self.query_router.route(query_embedding)
+            if route.direct and route.kind is QueryKind.NOTE:
+                logger.debug(f"Saving message from user {user_id} directly as a daily note")
+                saved_note = await self.obsidian_daily_notes_manager.log_daily_note(routing_text)
+                final_output = f"✅ Zapisano w dziennej notatce:\n{saved_note.strip()}"
+                self._save_message(user_id, message_type, query, final_output)
+                return final_output
+            # Replies to follow-ups depend on the conversation, so only routes the router marks cacheable are cached
+            if route.cacheable and self.response_cache is not None and not bypass_cache:
+                cache = self.response_cache
+                cached_output = cache.lookup(user_id, today, query_embedding)
+                if cached_output is not None:
+                    self._save_message(user_id, message_type, query, cached_output)
+                    return cached_output
+            if route.direct:
+                logger.debug(f"Routing message from user {user_id} directly to the {route.kind.value} agent")
+                starting_agent = await self._get_direct_agent(route.kind)
+            max_turns = route.max_turns
+
+        if starting_agent is None and self.ai_assistant_agent is None:
             logger.info(f"Initializing AI Assistant agent for user {user_id}")
             self.ai_assistant_agent = await get_ai_assistant_agent(
                 self.bot_settings.ai_assistant,
@@ -40,6 +114,8 @@ class AIAssistantService:
                 tz=self.bot_settings.tz,
                 embedding_indexer=self.obsidian_embedding_indexer,
             )
+        if starting_agent is None:
+            starting_agent = self.ai_assistant_agent
 
         recent_messages = list(
             self.db_service.list_message_logs(user_id=user_id, limit=self.bot_settings.ai_assistant.last_n_messages)
@@ -61,13 +137,98 @@ class AIAssistantService:
         full_query = f"{conversation_context}{query}\n\nToday is {datetime.now().isoformat()}"
 
         logger.debug(f"Running AI Assistant for user {user_id} with query including context")
-        result = await Runner.run(
-            self.ai_assistant_agent, input=full_query, max_turns=self.bot_settings.ai_assistant.max_turns
-        )
+        default_max_turns = self.bot_settings.ai_assistant.max_turns
+        try:
+            result = await self._run(starting_agent, full_query, max_turns, on_text_delta)
+        except MaxTurnsExceeded as e:
+            # A misrouted query can need more turns than its route allows; rerun it with the full budget unless the
+            # failed attempt already changed something that a second run would repeat
+            failed_items = e.run_data.new_items if e.run_data is not None else []
+            if max_turns >= default_max_turns or self._has_side_effects(failed_items):
+                raise
+            logger.warning(f"Query exceeded its routed budget of {max_turns} turns, retrying with {default_max_turns}")
+            # The query was likely misrouted, so the route's cacheability can't be trusted either
+            cache = None
+            result = await self._run(starting_agent, full_query, default_max_turns, on_text_delta)
         final_output = clean_ai_response(result.final_output)
         logger.debug(f"AI Assistant response: {final_output}")
 
+        if cache is not None and not self._has_side_effects(result.new_items):
+            cache.store(user_id, today, query_embedding, final_output)
+
+        self._save_message(user_id, message_type, query, final_output)
+        return final_output
+
+    async def _get_direct_agent(self, kind: QueryKind) -> Agent[Any]:
+        agent = self._direct_agents.get(kind)
+        if agent is not None:
+            return agent
+
+        ai_assistant_config = self.bot_settings.ai_assistant
+        if kind is QueryKind.OBSIDIAN:
+            # get_obsidian_agent memoizes the agent, so this shares it with the primary assistant's handoff
+            embedding_indexer = self.obsidian_embedding_indexer if ai_assistant_config.semantic_search_enabled else None
+            agent = await get_obsidian_agent(ai_assistant_config.obsidian_agent, embedding_indexer=embedding_indexer)
+        elif kind is QueryKind.PRODUCT_SEARCH:
+            agent = await get_polish_product_search_agent(ai_assistant_config.polish_product_search_agent)
+        else:
+            raise ValueError(f"No agent handles {kind.value} queries directly")
+        self._direct_agents[kind] = agent
+        return agent
+
+    async def _run(
+        self,
+        starting_agent: Agent[Any],
+        full_query: str,
+        max_turns: int,
+        on_text_delta: Callable[[str], Awaitable[None]] | None,
+    ) -> RunResultBase:
+        # Side-effecting tool calls are serialized per run through this context, so concurrent runs do not wait on
+        # each other
+        run_context = AIAssistantRunContext()
+        if on_text_delta is None:
+            return await Runner.run(starting_agent, input=full_query, context=run_context, max_turns=max_turns)
+        return await self._run_streamed(starting_agent, full_query, run_context, max_turns, on_text_delta)
+
+    async def _run_streamed(
+        self,
+        starting_agent: Agent[Any],
+        full_query: str,
+        run_context: AIAssistantRunContext,
+        max_turns: int,
+        on_text_delta: Callable[[str], Awaitable[None]],
+    ) -> RunResultBase:
+        result = Runner.run_streamed(starting_agent, input=full_query, context=run_context, max_turns=max_turns)
+        started_at = time.monotonic()
+        first_token_logged = False
+        # Agents with structured output (e.g. product search) stream JSON, which is not worth showing
+        stream_text = True
+        async for event in result.stream_events():
+            if isinstance(event, AgentUpdatedStreamEvent):
+                stream_text = event.new_agent.output_type in (None, str)
+            elif (
+                stream_text
+                and isinstance(event, RawResponsesStreamEvent)
+                and isinstance(event.data, ResponseTextDeltaEvent)
+            ):
+                if not first_token_logged:
+                    first_token_logged = True
+                    logger.debug(f"AI Assistant time to first token: {time.monotonic() - started_at:.2f}s")
+                await on_text_delta(event.data.delta)
+        return result
+
+    async def _embed_query(self, query: str) -> np.ndarray:
+        embeddings = await asyncio.to_thread(self.embedding_function, [query])
+        return np.asarray(embeddings[0], dtype=np.float32)
+
+    def _save_message(self, user_id: int, message_type: MessageType, query: str, response: str) -> None:
         # Save just the original query in the database, not the full context
-        message_entry = MessageEntry(user_id=user_id, message_type=message_type, content=query, response=final_output)
+        message_entry = MessageEntry(user_id=user_id, message_type=message_type, content=query, response=response)
         self.db_service.add_message_entry(message_entry)
-        return final_output
+
+    @staticmethod
+    def _has_side_effects(items: Sequence[RunItem]) -> bool:
+        return any(
+            isinstance(item, ToolCallItem) and getattr(item.raw_item, "name", None) in SIDE_EFFECT_TOOLS
+            for item in items
+        )
@@ -0,0 +1,158 @@
+import asyncio
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+
+class QueryKind(str, Enum):
+    CHAT = "chat"
+    NOTE = "note"
+    QUESTION = "question"
+    OBSIDIAN = "obsidian"
+    PRODUCT_SEARCH = "product_search"
+    MULTI_STEP_TASK = "multi_step_task"
+
+
+# Kinds that a specialist agent can answer without the primary assistant deciding on a handoff first
+DIRECT_AGENT_KINDS = frozenset({QueryKind.OBSIDIAN, QueryKind.PRODUCT_SEARCH})
+
+
+class QueryRouterConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = True
+    min_similarity: float = 0.55
+    direct_notes_enabled: bool = True
+    direct_note_similarity: float = 0.85
+    direct_note_margin: float = 0.2
+    direct_handoffs_enabled: bool = True
+    direct_handoff_margin: float = 0.2
+    # Kinds whose reply depends on the query and today's date but not on the preceding conversation
+    cacheable_kinds: frozenset[QueryKind] = frozenset(
+        {QueryKind.QUESTION, QueryKind.OBSIDIAN, QueryKind.PRODUCT_SEARCH}
+    )
+    templates: dict[QueryKind, list[str]] = {
+        QueryKind.CHAT: ["cześć", "dzięki!", "ok, super", "dzień dobry"],
+        QueryKind.NOTE: [
+            "kup mleko",
+            "spotkanie przesunięte na czwartek",
+            "pomysł na nową funkcję w aplikacji",
+            "dziś czuję się zmotywowany do pracy nad projektem",
+        ],
+        QueryKind.QUESTION: [
+            "jak spałem w tym tygodniu?",
+            "co robiłem wczoraj?",
+            "jaka jest prognoza pogody na jutro?",
+            "jak działa fotosynteza?",
+        ],
+        QueryKind.OBSIDIAN: [
+            "co pisałem o projekcie Phoenix w ostatnim miesiącu?",
+            "pokaż wszystkie notatki z tagiem #zdrowie",
+            "kiedy ostatnio wspominałem w notatkach o spotkaniu z Anną?",
+            "podsumuj moje refleksje z tego tygodnia",
+        ],
+        QueryKind.PRODUCT_SEARCH: [
+            "szukam lapka z RTX 4060 w dobrej cenie",
+            "gdzie najtaniej kupię słuchawki Sony WH-1000XM5?",
+            "znajdź najlepszą ofertę na ekspres do kawy",
+        ],
+        QueryKind.MULTI_STEP_TASK: [
+            "przeanalizuj moje dane ze snu i kalendarz z ostatniego miesiąca i znajdź powtarzające się wzorce",
+            "wyślij wiadomość do Anny i dodaj spotkanie do kalendarza",
+        ],
+    }
+    # Every budget leaves room for at least one tool call or handoff plus the reply
+    max_turns: dict[QueryKind, int] = {
+        QueryKind.CHAT: 2,
+        QueryKind.NOTE: 3,
+        QueryKind.QUESTION: 8,
+        QueryKind.OBSIDIAN: 8,
+        QueryKind.PRODUCT_SEARCH: 8,
+        QueryKind.MULTI_STEP_TASK: 25,
+    }
+
+
+@dataclass(frozen=True)
+class QueryRoute:
+    kind: QueryKind | None
+    similarity: float
+    max_turns: int
+    margin: float = 0.0
+    direct: bool = False
+    cacheable: bool = False
+
+
+class QueryRouter:
+    """Classifies queries by their similarity to canonical templates to pick the agent's turn budget.
+
+    Template embeddings are computed once, on the first routed query. Queries that resemble no template closely
+    enough keep the configured default budget. A route is marked ``direct`` when it is confident enough to skip the
+    primary assistant: near-verbatim notes that beat every other kind by ``direct_note_margin`` go straight to the
+    daily note, and Obsidian or product search queries
+    that beat every other kind by ``direct_handoff_margin`` go straight to the specialist agent.
+    """
+
+    def __init__(
+        self,
+        config: QueryRouterConfig,
+        embedding_function: Callable[[Sequence[str]], Sequence[Sequence[float]]],
+        default_max_turns: int,
+    ) -> None:
+        self._config = config
+        self._embedding_function = embedding_function
+        self._default_max_turns = default_max_turns
+        self._template_kinds: list[QueryKind] = [
+            kind for kind, templates in config.templates.items() for _ in templates
+        ]
+        self._template_matrix: np.ndarray | None = None
+        self._template_lock = asyncio.Lock()
+
+    async def route(self, embedding: np.ndarray) -> QueryRoute:
+        template_matrix = await self._get_template_matrix()
+        similarities = template_matrix @ embedding
+
+        best_by_kind: dict[QueryKind, float] = {}
+        for template_kind, template_similarity in zip(self._template_kinds, similarities.tolist(), strict=True):
+            best_by_kind[template_kind] = max(template_similarity, best_by_kind.get(template_kind, -1.0))
+        ranked = sorted(best_by_kind.items(), key=lambda item: item[1], reverse=True)
+        kind, similarity = ranked[0]
+        margin = similarity - ranked[1][1] if len(ranked) > 1 else similarity
+
+        if similarity < self._config.min_similarity:
+            return QueryRoute(kind=None, similarity=similarity, max_turns=self._default_max_turns, margin=margin)
+
+        if kind is QueryKind.NOTE:
+            direct = (
+                self._config.direct_notes_enabled
+                and similarity >= self._config.direct_note_similarity
+                and margin >= self._config.direct_note_margin
+            )
+        else:
+            direct = (
+                kind in DIRECT_AGENT_KINDS
+                and self._config.direct_handoffs_enabled
+                and margin >= self._config.direct_handoff_margin
+            )
+        max_turns = self._config.max_turns.get(kind, self._default_max_turns)
+        cacheable = kind in self._config.cacheable_kinds
+        logger.debug(
+            f"Routed query as {kind.value} (similarity {similarity:.3f}, margin {margin:.3f}, "
+            f"max_turns {max_turns}, direct {direct}, cacheable {cacheable})"
+        )
+        return QueryRoute(
+            kind=kind, similarity=similarity, max_turns=max_turns, margin=margin, direct=direct, cacheable=cacheable
+        )
+
+    async def _get_template_matrix(self) -> np.ndarray:
+        async with self._template_lock:
+            if self._template_matrix is None:
+                templates = [
+                    template for kind_templates in self._config.templates.values() for template in kind_templates
+                ]
+                embeddings = await asyncio.to_thread(self._embedding_function, templates)
+                self._template_matrix = np.asarray(embeddings, dtype=np.float32)
+        return self._template_matrix
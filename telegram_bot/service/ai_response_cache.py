@@ -0,0 +1,74 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+NO_CACHE_TAG = "#nocache"
+
+
+class AIResponseCacheConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = True
+    similarity_threshold: float = 0.92
+    ttl_seconds: float = 600.0
+    max_entries_per_user: int = 100
+
+
+@dataclass
+class _CacheEntry:
+    day: date
+    embedding: np.ndarray
+    response: str
+    created_at: float
+
+
+class AIResponseCache:
+    """Per-user semantic cache of AI assistant replies.
+
+    Callers embed queries with the same normalized sentence-transformer model used for the Obsidian index, so the
+    cosine similarity between two queries is a plain dot product. Callers only cache queries whose reply does not
+    depend on the preceding conversation, and a reply is only reused on the day it was generated, because the agent
+    answers relative to today's date.
+    """
+
+    def __init__(self, config: AIResponseCacheConfig) -> None:
+        self._config = config
+        self._entries: defaultdict[int, list[_CacheEntry]] = defaultdict(list)
+
+    @staticmethod
+    def is_bypassed(query: str) -> bool:
+        return NO_CACHE_TAG in query
+
+    @staticmethod
+    def strip_bypass_tag(query: str) -> str:
+        return query.replace(NO_CACHE_TAG, "").strip()
+
+    def lookup(self, user_id: int, day: date, embedding: np.ndarray) -> str | None:
+        entries = [entry for entry in self._live_entries(user_id) if entry.day == day]
+        if not entries:
+            return None
+
+        similarities = np.stack([entry.embedding for entry in entries]) @ embedding
+        best_index = int(np.argmax(similarities))
+        if similarities[best_index] < self._config.similarity_threshold:
+            return None
+
+        best = entries[best_index]
+        logger.debug(f"AI response cache hit for user {user_id} (similarity {similarities[best_index]:.3f})")
+        return best.response
+
+    def store(self, user_id: int, day: date, embedding: np.ndarray, response: str) -> None:
+        entries = self._live_entries(user_id)
+        entries.append(_CacheEntry(day=day, embedding=embedding, response=response, created_at=time.monotonic()))
+        del entries[: -self._config.max_entries_per_user]
+
+    def _live_entries(self, user_id: int) -> list[_CacheEntry]:
+        cutoff = time.monotonic() - self._config.ttl_seconds
+        entries = self._entries[user_id]
+        entries[:] = [entry for entry in entries if entry.created_at >= cutoff]
+        return entries
@@ -96,7 +96,7 @@ class EkExportCalendarBackend(CalendarBackend):
 
     @staticmethod
     def _build_date_range(query: CalendarEventQuery, config: CalendarConfig) -> tuple[date, date]:
-        tz = ZoneInfo(config.timezone)
+        tz = config.tz
         today = datetime.now(tz=tz).date()
         start_date = query.start_date or (today - timedelta(days=config.default_lookback_days))
         end_date = query.end_date or (today + timedelta(days=config.default_lookahead_days + 1))
@@ -341,9 +341,9 @@ class CalendarService:
             day_events = events_by_date[event_date]
 
             # Format date header
-            if event_date == datetime.now(ZoneInfo(self.config.timezone)).date():
+            if event_date == datetime.now(self.config.tz).date():
                 date_header = "Today"
-            elif event_date == datetime.now(ZoneInfo(self.config.timezone)).date() + timedelta(days=1):
+            elif event_date == datetime.now(self.config.tz).date() + timedelta(days=1):
                 date_header = "Tomorrow"
             else:
                 date_header = event_date.strftime("%A, %B %d")
@@ -383,7 +383,7 @@ class CalendarService:
                     reminders_by_list[list_name],
                     key=lambda x: (
                         x.completed,  # False comes first, True comes last
-                        x.due_date or datetime.max.replace(tzinfo=ZoneInfo(self.config.timezone)),
+                        x.due_date or datetime.max.replace(tzinfo=self.config.tz),
                     ),
                 )
                 for r in sorted_list:
@@ -399,7 +399,7 @@ class CalendarService:
 
     async def get_today_events(self, include_reminders: bool = True) -> CalendarEventsResult:
         """Convenience method to get today's events."""
-        today = datetime.now(ZoneInfo(self.config.timezone)).date()
+        today = datetime.now(self.config.tz).date()
         query = CalendarEventQuery(
             start_date=today, end_date=today + timedelta(days=1), include_reminders=include_reminders
         )
@@ -407,7 +407,7 @@ class CalendarService:
 
     async def get_upcoming_events(self, days: int = 3) -> CalendarEventsResult:
         """Convenience method to get upcoming events for the next N days."""
-        today = datetime.now(ZoneInfo(self.config.timezone)).date()
+        today = datetime.now(self.config.tz).date()
         end_date = today + timedelta(days=days + 1)
         query = CalendarEventQuery(start_date=today, end_date=end_date)
         return await self.get_events(query)
@@ -6,7 +6,7 @@ from enum import Enum
 from typing import Any, Literal, Optional
 
 import pandas as pd
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class BioSignalType(str, Enum):
@@ -109,6 +109,8 @@ class SleepCorrelationConfig(BaseModel):
 class CorrelationFetchConfig(BaseModel):
     """Shared configuration for fetching and displaying correlation events across different surfaces."""
 
+    model_config = ConfigDict(frozen=True)
+
     lookback_days: int = Field(default=7, gt=0, description="Number of days to look back for correlation events")
     max_events: int = Field(default=6, gt=0, description="Maximum number of correlation events to fetch")
 
@@ -87,6 +87,7 @@ class LifeContextBundle:
 @dataclass(slots=True)
 class LifeContextFormattedResponse:
     bundle: LifeContextBundle
-    sections: dict[str, Any]
+    # Every section holds both a "data" and a "markdown" entry, either of which may be None
+    sections: dict[str, dict[str, Any | None]]
     rendered_markdown: str | None
     error: str | None = None
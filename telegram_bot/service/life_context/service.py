@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
@@ -37,4 +38,5 @@ class LifeContextService:
 
     async def build_context(self, request: LifeContextRequest) -> LifeContextFormattedResponse:
         bundle = await self._fetcher.fetch(request)
-        return self._formatter.format(bundle, request)
+        # Rendering a multi-week bundle is CPU work; keep it off the event loop like the DB lookups in the fetcher
+        return await asyncio.to_thread(self._formatter.format, bundle, request)
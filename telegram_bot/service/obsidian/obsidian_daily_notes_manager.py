@@ -10,7 +10,7 @@ from telegram_bot.service.obsidian.obsidian_service import ObsidianService
 
 
 class ObsidianDailyNotesManagerConfig(BaseModel):
-    managing_llm_config: LLMConfig = DefaultLLMConfig.GEMINI_FLASH
+    managing_llm_config: LLMConfig = Field(default_factory=DefaultLLMConfig.gemini_flash)
     note_transcription_and_tagging_prompt: str = """<task>
 Przetwórz notatkę użytkownika do jego dziennej notatki w Obsidian. Popraw tekst jeśli potrzeba (literówki, czytelność), zachowując oryginalny sens i osobisty styl. Wygeneruj trafne, kontekstowe tagi.
 </task>
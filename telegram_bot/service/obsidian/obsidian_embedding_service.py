@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -16,6 +18,11 @@ if TYPE_CHECKING:
     from telegram_bot.config import ChromaVectorStoreConfig
 
 _STATE_FILENAME = "chroma_index_state.json"
+# Concurrent searches beyond the core count only queue up behind the embedding model
+_MAX_CONCURRENT_SEARCHES = os.cpu_count() or 1
+# Changed notes are read and indexed this many at a time, so a first index never holds the whole vault in memory
+# and writers only wait for one batch behind the vault lock
+_READ_BATCH_SIZE = 64
 
 
 @dataclass
@@ -42,6 +49,7 @@ class ObsidianEmbeddingIndexer:
         self._out_dir = Path(out_dir)
         self._state_path = state_path or (self._out_dir / _STATE_FILENAME)
         self._text_splitter = text_splitter or self._build_text_splitter(config)
+        self._search_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SEARCHES)
 
     async def refresh_incremental(self) -> EmbeddingRefreshStats:
         logger.info("Starting Obsidian embedding refresh")
@@ -53,11 +61,11 @@ class ObsidianEmbeddingIndexer:
         skipped_files = 0
         upserted_chunks = 0
 
-        documents_to_upsert: list[VectorDocument] = []
         valid_ids: set[str] = set()
 
         deleted_candidates = set(previous_files.keys())
 
+        changed_files: list[tuple[str, str, str]] = []
         for file_path in self._iter_markdown_files():
             relative_path = file_path.relative_to(self._vault_root).as_posix()
             file_stats = file_path.stat()
@@ -73,40 +81,48 @@ class ObsidianEmbeddingIndexer:
                 deleted_candidates.discard(relative_path)
                 continue
 
-            content = await self._obsidian_service.safe_read_file(relative_path)
-            title = self._extract_title(content, relative_path)
-            chunks = self._split_content(content)
-
-            doc_ids: list[str] = []
-            for index, chunk in enumerate(chunks):
-                doc_id = self._build_document_id(relative_path, index)
-                metadata = {
-                    "relative_path": relative_path,
-                    "chunk_index": index,
+            changed_files.append((relative_path, checksum, mtime_iso))
+
+        for batch_start in range(0, len(changed_files), _READ_BATCH_SIZE):
+            batch_files = changed_files[batch_start : batch_start + _READ_BATCH_SIZE]
+            contents = await self._obsidian_service.safe_read_files(
+                [relative_path for relative_path, _, _ in batch_files]
+            )
+            documents_to_upsert: list[VectorDocument] = []
+            for (relative_path, checksum, mtime_iso), content in zip(batch_files, contents, strict=True):
+                title = self._extract_title(content, relative_path)
+                chunks = self._split_content(content)
+
+                doc_ids: list[str] = []
+                for index, chunk in enumerate(chunks):
+                    doc_id = self._build_document_id(relative_path, index)
+                    metadata = {
+                        "relative_path": relative_path,
+                        "chunk_index": index,
+                        "checksum": checksum,
+                        "mtime": mtime_iso,
+                        "title": title,
+                    }
+                    metadata.update(getattr(chunk, "metadata", {}) or {})
+                    document = VectorDocument(id=doc_id, content=getattr(chunk, "page_content", ""), metadata=metadata)
+                    doc_ids.append(doc_id)
+                    documents_to_upsert.append(document)
+                processed_files += 1
+                upserted_chunks += len(doc_ids)
+                valid_ids.update(doc_ids)
+                current_state[relative_path] = {
                     "checksum": checksum,
                     "mtime": mtime_iso,
+                    "doc_ids": doc_ids,
                     "title": title,
                 }
-                metadata.update(getattr(chunk, "metadata", {}) or {})
-                document = VectorDocument(id=doc_id, content=getattr(chunk, "page_content", ""), metadata=metadata)
-                doc_ids.append(doc_id)
-                documents_to_upsert.append(document)
-            processed_files += 1
-            upserted_chunks += len(doc_ids)
-            valid_ids.update(doc_ids)
-            current_state[relative_path] = {
-                "checksum": checksum,
-                "mtime": mtime_iso,
-                "doc_ids": doc_ids,
-                "title": title,
-            }
-            deleted_candidates.discard(relative_path)
+                deleted_candidates.discard(relative_path)
 
-        deleted_files = len(deleted_candidates)
+            if documents_to_upsert:
+                for batch in self._batch_documents(documents_to_upsert, self._config.embedding_batch_size):
+                    self._vector_store.upsert(batch)
 
-        if documents_to_upsert:
-            for batch in self._batch_documents(documents_to_upsert, self._config.embedding_batch_size):
-                self._vector_store.upsert(batch)
+        deleted_files = len(deleted_candidates)
 
         self._vector_store.delete_missing(valid_ids)
         self._save_state({"files": current_state})
@@ -136,7 +152,9 @@ class ObsidianEmbeddingIndexer:
         path_filter: str | None = None,
     ) -> Sequence[VectorMatch]:
         where = {"relative_path": path_filter} if path_filter else None
-        return self._vector_store.query(query, limit=limit, where=where)
+        # Embedding the query is blocking and CPU-bound, so keep it off the event loop
+        async with self._search_semaphore:
+            return await asyncio.to_thread(self._vector_store.query, query, limit=limit, where=where)
 
     @property
     def _vault_root(self) -> Path:
@@ -67,6 +67,10 @@ async def file_lock(lock_file_path: Path, lock_type: int = fcntl.LOCK_EX, timeou
                 pass  # May already be gone
 
 
+def _read_text_files(paths: list[Path], encoding: str) -> list[str]:
+    return [path.read_text(encoding=encoding) for path in paths]
+
+
 class ObsidianConfig(BaseModel):
     """Configuration for Obsidian vault and directory structure."""
 
@@ -560,6 +564,35 @@ class ObsidianService:
                     logger.error(f"Failed to read file {path}: {exc}")
                     raise
 
+    async def safe_read_files(self, file_paths: Iterable[Union[str, Path]], encoding: str = "utf-8") -> list[str]:
+        """Read several files within a single read-only git transaction.
+
+        The vault lock, worktree check and git sync run once for the whole batch and every file is read in one
+        worker thread, instead of once per file as with repeated ``safe_read_file`` calls. Writers take the
+        exclusive vault lock and replace files atomically, so no per-file locks are needed while it is held.
+
+        Args:
+            file_paths: Paths of the files to read
+            encoding: File encoding (default: utf-8)
+
+        Returns:
+            File contents, in the same order as ``file_paths``
+
+        Raises:
+            OSError: If a file cannot be read
+            FileNotFoundError: If a file does not exist
+        """
+        paths = [self._resolve_vault_path(file_path) for file_path in file_paths]
+        if not paths:
+            return []
+
+        async with self._vault_transaction(read_only=True):
+            try:
+                return await asyncio.to_thread(_read_text_files, paths, encoding)
+            except Exception as exc:
+                logger.error(f"Failed to read {len(paths)} files from the vault: {exc}")
+                raise
+
     async def safe_write_file(self, file_path: Union[str, Path], content: str, encoding: str = "utf-8") -> None:
         """Write content to a file atomically inside a git-backed transaction.
 
@@ -16,6 +16,11 @@ class ScheduledJobsFacade:
     def __init__(self, scheduler: ScheduledTaskService) -> None:
         self._scheduler = scheduler
 
+    @property
+    def jobs_version(self) -> int:
+        """Changes whenever jobs are registered or cleared."""
+        return self._scheduler.jobs_version
+
     def list_jobs(self) -> Sequence[ScheduledJobDescriptor]:
         return self._scheduler.list_jobs()
 
@@ -54,6 +54,8 @@ class ScheduledTaskService:
         """
         self._cron_jobs: list[aiocron.Cron] = []
         self._job_entries: dict[str, _ScheduledJobEntry] = {}
+        # Bumped whenever the set of registered jobs changes so callers can cache views of list_jobs()
+        self._jobs_version = 0
         self._background_task_executor = background_task_executor
         self._is_running = False
         logger.info("ScheduledTaskService initialized.")
@@ -140,6 +142,7 @@ class ScheduledTaskService:
             cron_handle=cron_job,
             runner=run_job,
         )
+        self._jobs_version += 1
         logger.info(
             f"Added direct async scheduled job: '{func.__name__}' with schedule '{cron_expression}' and id '{job_id}'"
         )
@@ -240,11 +243,16 @@ class ScheduledTaskService:
             cron_handle=cron_job,
             runner=run_job,
         )
+        self._jobs_version += 1
         logger.info(
             f"Added BackgroundTaskExecutor job: '{target_fn.__name__}' "
             f"(async: {inspect.iscoroutinefunction(target_fn)}) with schedule '{cron_expression}' and id '{job_id}'"
         )
 
+    @property
+    def jobs_version(self) -> int:
+        return self._jobs_version
+
     def list_jobs(self) -> list[ScheduledJobDescriptor]:
         """Return descriptors for all registered jobs sorted by display name."""
         return sorted((entry.descriptor for entry in self._job_entries.values()), key=lambda d: d.display_name)
@@ -307,5 +315,6 @@ class ScheduledTaskService:
 
         self._cron_jobs.clear()
         self._job_entries.clear()
+        self._jobs_version += 1
         self._is_running = False
         logger.info("ScheduledTaskService stopped and all jobs cancelled/cleared.")
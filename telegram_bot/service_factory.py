@@ -2,6 +2,8 @@ from functools import cached_property
 
 from telegram_bot.config import BotSettings
 from telegram_bot.service.ai_assitant_service import AIAssistantService
+from telegram_bot.service.ai_query_router import QueryRouter
+from telegram_bot.service.ai_response_cache import AIResponseCache
 from telegram_bot.service.background_task_executor import BackgroundTaskExecutor
 from telegram_bot.service.calendar_service.calendar_service import CalendarService
 from telegram_bot.service.context_trigger import ContextAggregator
@@ -67,8 +69,26 @@ class ServiceFactory:
             obsidian_daily_notes_manager=self.obsidian_daily_notes_manager,
             life_context_service=self.life_context_service,
             obsidian_embedding_indexer=self.obsidian_embedding_indexer,
+            embedding_function=self.embedding_function,
+            response_cache=self.ai_response_cache,
+            query_router=self.ai_query_router,
         )
 
+    @cached_property
+    def ai_response_cache(self) -> AIResponseCache | None:
+        cache_config = self.bot_settings.ai_assistant.response_cache
+        # The router decides which queries are safe to cache, so there is nothing to cache without it
+        if not cache_config.enabled or self.ai_query_router is None:
+            return None
+        return AIResponseCache(cache_config)
+
+    @cached_property
+    def ai_query_router(self) -> QueryRouter | None:
+        ai_assistant_config = self.bot_settings.ai_assistant
+        if not ai_assistant_config.query_router.enabled:
+            return None
+        return QueryRouter(ai_assistant_config.query_router, self.embedding_function, ai_assistant_config.max_turns)
+
     @cached_property
     def garmin_data_analysis_service(self) -> GarminDataAnalysisService:
         return GarminDataAnalysisService(garmin_service=self.garmin_connect_service, out_dir=self.bot_settings.out_dir)
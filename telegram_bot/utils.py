@@ -2,6 +2,7 @@
 
 import json
 import re
+import time
 from pathlib import Path
 from typing import Optional, Union
 
@@ -93,11 +94,29 @@ def _format_generic_model(data: dict, model_name: str) -> str:
     return "\n".join(lines)
 
 
+_BOLD_PATTERN = re.compile(r"\*\*(.+?)\*\*")
+_TELEGRAM_MARKDOWN_PATTERN = re.compile(
+    r"^##\s+(?P<header>.+)$|\*\*(?P<bold>.+?)\*\*|^>\s+",
+    flags=re.MULTILINE,
+)
+
+
+def _rewrite_markdown_match(match: re.Match[str]) -> str:
+    header = match.group("header")
+    if header is not None:
+        # Bold markers inside a header collapse against the added emphasis, as they would in a second pass
+        return _BOLD_PATTERN.sub(r"*\1*", f"*{header}*") + "\n"
+    bold = match.group("bold")
+    if bold is not None:
+        return f"*{bold}*"
+    return ""
+
+
 def convert_markdown_to_telegram(text: str) -> str:
     """
     Convert common markdown patterns to Telegram Markdown v1 compatible format.
 
-    Simple conversions:
+    Simple conversions, applied in a single pass over the text:
     - ## Headers -> *Bold text* with newlines
     - **bold** -> *bold*
     - Remove > quote markers
@@ -105,16 +124,7 @@ def convert_markdown_to_telegram(text: str) -> str:
     if not text:
         return text
 
-    # Convert headers (## Header -> *Header* with extra newline)
-    text = re.sub(r"^##\s+(.+)$", r"*\1*\n", text, flags=re.MULTILINE)
-
-    # Convert **bold** to *bold*
-    text = re.sub(r"\*\*(.+?)\*\*", r"*\1*", text)
-
-    # Remove > quote markers at start of lines
-    text = re.sub(r"^>\s+", "", text, flags=re.MULTILINE)
-
-    return text
+    return _TELEGRAM_MARKDOWN_PATTERN.sub(_rewrite_markdown_match, text)
 
 
 def clean_ai_response(response: Union[str, BaseModel]) -> str:
@@ -155,6 +165,10 @@ def clean_ai_response(response: Union[str, BaseModel]) -> str:
         return str(response)
 
 
+_MARKDOWN_V1_SPECIAL_CHARS = re.compile(r"[*_`\[]")
+_MARKDOWN_V1_ESCAPE_TABLE = str.maketrans({char: f"\\{char}" for char in "*_`["})
+
+
 def escape_markdown_v1(text: str) -> str:
     """
     Escape special characters for Telegram MarkdownV1.
@@ -168,15 +182,35 @@ def escape_markdown_v1(text: str) -> str:
     Returns:
         Escaped text safe for Telegram MarkdownV1
     """
-    if not text:
+    if not text or not _MARKDOWN_V1_SPECIAL_CHARS.search(text):
         return text
 
-    # Escape special markdown characters
-    special_chars = ["*", "_", "`", "["]
-    for char in special_chars:
-        text = text.replace(char, f"\\{char}")
+    return text.translate(_MARKDOWN_V1_ESCAPE_TABLE)
+
 
-    return text
+_NON_WHITESPACE = re.compile(r"\S")
+_WHITESPACE_TO_SPACE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+
+def truncate_snippet(text: str, max_length: int) -> str:
+    """
+    Build a single-line preview of at most ``max_length`` characters from the start of ``text``.
+
+    Only the head of long texts can end up in the preview, so only that part is cleaned up. The preview starts at
+    the first visible character and ends with an ellipsis exactly when more non-whitespace text follows the limit.
+
+    Args:
+        text: Text to preview
+        max_length: Maximum length of the preview, including the ellipsis
+
+    Returns:
+        Preview with newlines and tabs replaced by spaces
+    """
+    first_visible = _NON_WHITESPACE.search(text)
+    start = first_visible.start() if first_visible else len(text)
+    if _NON_WHITESPACE.search(text, start + max_length):
+        return text[start : start + max_length - 3].translate(_WHITESPACE_TO_SPACE).rstrip() + "…"
+    return text[start : start + max_length].translate(_WHITESPACE_TO_SPACE).rstrip()
 
 
 def _is_section_header(line: str) -> bool:
@@ -276,3 +310,64 @@ async def send_message_chunks(bot: Bot, chat_id: int, text: str, max_length: int
     for chunk in chunks:
         if chunk.strip():
             await _send_single_chunk(bot, chat_id, chunk)
+
+
+class StreamingReply:
+    """A Telegram message that is progressively edited while an AI response is being generated.
+
+    Edits are throttled to respect Telegram's per-chat rate limits and are sent as plain text, because partial
+    markdown is usually unbalanced. The final text replaces the placeholder with markdown formatting.
+    """
+
+    PLACEHOLDER = "⏳"
+    FAILURE_TEXT = "❌ An error occurred while generating the response."
+    EDIT_INTERVAL_S = 1.0
+
+    def __init__(self, bot: Bot, chat_id: int, message_id: int, max_length: int = 4096) -> None:
+        self._bot = bot
+        self._chat_id = chat_id
+        self._message_id = message_id
+        self._max_length = max_length
+        self._parts: list[str] = []
+        self._last_edit_at = 0.0
+
+    @classmethod
+    async def start(cls, bot: Bot, chat_id: int) -> "StreamingReply":
+        message = await bot.send_message(chat_id=chat_id, text=cls.PLACEHOLDER)
+        return cls(bot, chat_id, message.message_id)
+
+    async def append(self, delta: str) -> None:
+        self._parts.append(delta)
+        now = time.monotonic()
+        if now - self._last_edit_at < self.EDIT_INTERVAL_S:
+            return
+        self._last_edit_at = now
+        partial = "".join(self._parts)[: self._max_length]
+        if partial.strip():
+            await self._edit(partial, parse_mode=None)
+
+    async def finish(self, text: str) -> None:
+        if not text.strip():
+            await self._bot.delete_message(chat_id=self._chat_id, message_id=self._message_id)
+            return
+
+        first_chunk, *remaining_chunks = _split_text_into_chunks(text, self._max_length)
+        if not await self._edit(first_chunk, parse_mode=ParseMode.MARKDOWN):
+            await self._edit(first_chunk, parse_mode=None)
+        for chunk in remaining_chunks:
+            if chunk.strip():
+                await _send_single_chunk(self._bot, self._chat_id, chunk)
+
+    async def fail(self, text: str = FAILURE_TEXT) -> None:
+        """Replace the placeholder, and any partial reply, with a plain text failure notice."""
+        await self._edit(text, parse_mode=None)
+
+    async def _edit(self, text: str, parse_mode: Optional[str]) -> bool:
+        try:
+            await self._bot.edit_message_text(
+                text=text, chat_id=self._chat_id, message_id=self._message_id, parse_mode=parse_mode
+            )
+            return True
+        except TelegramError as e:
+            logger.warning(f"Failed to edit streamed message: {e}")
+            return False
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from agents import FunctionTool
+
+from telegram_bot.ai_assistant.agents.ai_assitant_agent import AIAssistantRunContext, _serialize_tool
+
+
+def _build_tracked_tools() -> tuple[FunctionTool, FunctionTool, list[int]]:
+    """Return two serialized tools and a list recording the maximum number of overlapping calls."""
+    max_active = [0]
+    active = 0
+
+    async def side_effect(_ctx, arguments: str) -> str:
+        nonlocal active
+        active += 1
+        max_active[0] = max(max_active[0], active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return arguments
+
+    def build_tool(name: str) -> FunctionTool:
+        return FunctionTool(name=name, description="", params_json_schema={}, on_invoke_tool=side_effect)
+
+    return _serialize_tool(build_tool("first")), _serialize_tool(build_tool("second")), max_active
+
+
+@pytest.mark.asyncio
+async def test_serialized_tools_never_overlap_within_a_run():
+    first, second, max_active = _build_tracked_tools()
+    ctx = SimpleNamespace(context=AIAssistantRunContext())
+
+    results = await asyncio.gather(first.on_invoke_tool(ctx, "a"), second.on_invoke_tool(ctx, "b"))
+
+    assert results == ["a", "b"]
+    assert max_active == [1]
+
+
+@pytest.mark.asyncio
+async def test_serialized_tools_of_different_runs_do_not_wait_for_each_other():
+    first, second, max_active = _build_tracked_tools()
+
+    await asyncio.gather(
+        first.on_invoke_tool(SimpleNamespace(context=AIAssistantRunContext()), "a"),
+        second.on_invoke_tool(SimpleNamespace(context=AIAssistantRunContext()), "b"),
+    )
+
+    assert max_active == [2]
+
+
+@pytest.mark.asyncio
+async def test_product_search_handoff_builds_agent_on_first_transfer():
+    from telegram_bot.ai_assistant.agents import PolishProductSearchConfig, get_polish_product_search_handoff
+
+    handoff = get_polish_product_search_handoff(PolishProductSearchConfig())
+
+    first = await handoff.on_invoke_handoff(None, "{}")
+    second = await handoff.on_invoke_handoff(None, "{}")
+
+    assert handoff.agent_name == first.name == "PolishProductSearchAgent"
+    assert first is second
+
+
+def test_product_search_handoff_schema_is_strict():
+    from agents.strict_schema import ensure_strict_json_schema
+
+    from telegram_bot.ai_assistant.agents import PolishProductSearchConfig, get_polish_product_search_handoff
+
+    handoff = get_polish_product_search_handoff(PolishProductSearchConfig())
+
+    assert handoff.strict_json_schema
+    assert handoff.input_json_schema["type"] == "object"
+    assert ensure_strict_json_schema(dict(handoff.input_json_schema)) == handoff.input_json_schema
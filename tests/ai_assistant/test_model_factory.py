@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from telegram_bot.ai_assistant.model_factory import ModelFactory, ModelProvider
+
+
+def test_models_for_same_endpoint_share_client():
+    first = ModelFactory.build_model(ModelProvider.OPENAI, api_key="test-key", model_name="gpt-5")
+    second = ModelFactory.build_model(ModelProvider.OPENAI, api_key="test-key", model_name="gpt-5-mini")
+    custom = ModelFactory.build_model(
+        ModelProvider.OPENAI, api_key="test-key", model_name="gpt-5", client_kwargs={"timeout": 5}
+    )
+
+    assert first._client is second._client
+    assert custom._client is not first._client
@@ -63,8 +63,9 @@ async def test_obsidian_agent_registers_semantic_search_tool(monkeypatch):
 
     monkeypatch.setattr(module, "MCPServerStdio", StubMCPServer)
     monkeypatch.setattr(module, "Agent", FakeObsidianAgent)
-    monkeypatch.setattr(module.atexit, "register", lambda *args, **kwargs: None)
     monkeypatch.setattr(module.ModelFactory, "build_model", lambda **kwargs: "model")
+    monkeypatch.setattr(module, "_agent_cache", {})
+    monkeypatch.setattr(module, "_mcp_servers", {})
 
     config = module.ObsidianAgentConfig()
     indexer = StubIndexer()
@@ -75,3 +76,49 @@ async def test_obsidian_agent_registers_semantic_search_tool(monkeypatch):
         tool for tool in agent.tools if "semantic_search" in getattr(tool, "name", getattr(tool, "__name__", ""))
     ]
     assert semantic_tools, "Obsidian agent should expose semantic_search tool"
+
+
+@pytest.mark.asyncio
+async def test_obsidian_agent_is_cached_per_config_and_indexer(monkeypatch):
+    from telegram_bot.ai_assistant.agents import obsidian_agent as module
+
+    monkeypatch.setattr(module, "MCPServerStdio", StubMCPServer)
+    monkeypatch.setattr(module, "Agent", FakeObsidianAgent)
+    monkeypatch.setattr(module.ModelFactory, "build_model", lambda **kwargs: "model")
+    monkeypatch.setattr(module, "_agent_cache", {})
+    monkeypatch.setattr(module, "_mcp_servers", {})
+
+    config = module.ObsidianAgentConfig()
+    indexer = StubIndexer()
+
+    first = await module.get_obsidian_agent(config, embedding_indexer=indexer)
+    second = await module.get_obsidian_agent(module.ObsidianAgentConfig(), embedding_indexer=indexer)
+    other = await module.get_obsidian_agent(config, embedding_indexer=StubIndexer())
+
+    assert first is second
+    assert other is not first
+    assert other.kwargs["mcp_servers"][0] is first.kwargs["mcp_servers"][0]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_obsidian_mcp_servers_stops_spawned_servers(monkeypatch):
+    from telegram_bot.ai_assistant.agents import obsidian_agent as module
+
+    cleaned: list[StubMCPServer] = []
+
+    class TrackingMCPServer(StubMCPServer):
+        async def cleanup(self) -> None:
+            cleaned.append(self)
+
+    monkeypatch.setattr(module, "MCPServerStdio", TrackingMCPServer)
+    monkeypatch.setattr(module, "Agent", FakeObsidianAgent)
+    monkeypatch.setattr(module.ModelFactory, "build_model", lambda **kwargs: "model")
+    monkeypatch.setattr(module, "_agent_cache", {})
+    monkeypatch.setattr(module, "_mcp_servers", {})
+
+    await module.get_obsidian_agent(module.ObsidianAgentConfig(), embedding_indexer=StubIndexer())
+    await module.cleanup_obsidian_mcp_servers()
+
+    assert len(cleaned) == 1
+    assert not module._mcp_servers
+    assert not module._agent_cache
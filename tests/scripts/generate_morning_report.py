@@ -8,6 +8,7 @@ a personalized morning report based on Garmin data and Obsidian notes.
 Usage:
     python generate_morning_report.py --obsidian_root /path/to/obsidian/vault
 """
+
 import argparse
 import asyncio
 import sys
@@ -54,7 +55,7 @@ async def main():
 
     # Configure morning report service
     morning_config = MorningReportConfig(
-        summarizing_llm_config=DefaultLLMConfig.GEMINI_PRO,
+        summarizing_llm_config=DefaultLLMConfig.gemini_pro(),
         number_of_days=args.days,
         garmin_container_name="garmin-fetch-data",
     )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import threading
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
@@ -52,6 +53,9 @@ class StubObsidianService:
         absolute_path = self.config.obsidian_root_dir / relative_path
         return absolute_path.read_text(encoding="utf-8")
 
+    async def safe_read_files(self, relative_paths: Sequence[str]) -> list[str]:
+        return [await self.safe_read_file(relative_path) for relative_path in relative_paths]
+
 
 class SimpleSplitter:
     def __init__(self, chunk_size: int, chunk_overlap: int) -> None:
@@ -124,6 +128,40 @@ async def test_refresh_incremental_processes_changed_files(obsidian_setup, split
     assert {doc.id for doc in vector_store.upsert_calls[-1]} == {"note2.md::chunk-0"}
 
 
+@pytest.mark.asyncio
+async def test_refresh_incremental_reads_changed_files_in_batches(obsidian_setup, splitter, monkeypatch):
+    from telegram_bot.service.obsidian import obsidian_embedding_service
+    from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
+
+    monkeypatch.setattr(obsidian_embedding_service, "_READ_BATCH_SIZE", 1)
+    vault, out_dir = obsidian_setup
+    vector_store = StubVectorStore()
+    service = StubObsidianService(vault)
+    read_batches: list[list[str]] = []
+    read_files = service.safe_read_files
+
+    async def record_read_files(relative_paths: Sequence[str]) -> list[str]:
+        read_batches.append(list(relative_paths))
+        return await read_files(relative_paths)
+
+    service.safe_read_files = record_read_files
+    config = ChromaVectorStoreConfig(chunk_size=splitter.chunk_size, chunk_overlap=splitter.chunk_overlap)
+    indexer = ObsidianEmbeddingIndexer(
+        obsidian_service=service,
+        vector_store=vector_store,
+        config=config,
+        out_dir=out_dir,
+        text_splitter=splitter,
+    )
+
+    stats = await indexer.refresh_incremental()
+
+    assert sorted(read_batches) == [["note1.md"], ["note2.md"]]
+    assert stats.processed_files == 2
+    assert len(vector_store.upsert_calls) == 2
+    assert vector_store.delete_missing_calls[-1] == {"note1.md::chunk-0", "note2.md::chunk-0"}
+
+
 @pytest.mark.asyncio
 async def test_refresh_incremental_deletes_removed_files(obsidian_setup, splitter):
     from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
@@ -174,6 +212,33 @@ async def test_semantic_search_delegates_to_vector_store(obsidian_setup, splitte
     assert vector_store.query_calls[-1] == _QueryCall("hello", 3, {"relative_path": "note1.md"})
 
 
+@pytest.mark.asyncio
+async def test_semantic_search_queries_off_event_loop(obsidian_setup, splitter):
+    from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
+
+    query_threads: list[int] = []
+
+    class ThreadRecordingVectorStore(StubVectorStore):
+        def query(self, query_text, limit=5, where=None):
+            query_threads.append(threading.get_ident())
+            return super().query(query_text, limit, where)
+
+    vault, out_dir = obsidian_setup
+    config = ChromaVectorStoreConfig(chunk_size=splitter.chunk_size, chunk_overlap=splitter.chunk_overlap)
+    indexer = ObsidianEmbeddingIndexer(
+        obsidian_service=StubObsidianService(vault),
+        vector_store=ThreadRecordingVectorStore(),
+        config=config,
+        out_dir=out_dir,
+        text_splitter=splitter,
+    )
+
+    await asyncio.gather(indexer.semantic_search("hello"), indexer.semantic_search("world"))
+
+    assert len(query_threads) == 2
+    assert threading.get_ident() not in query_threads
+
+
 @pytest.mark.asyncio
 async def test_metadata_contains_expected_fields(obsidian_setup, splitter):
     from telegram_bot.service.obsidian.obsidian_embedding_service import ObsidianEmbeddingIndexer
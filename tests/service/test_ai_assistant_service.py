@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from agents import MaxTurnsExceeded
+
+from telegram_bot.service.ai_assitant_service import AIAssistantService
+from telegram_bot.service.ai_query_router import QueryKind, QueryRoute
+from telegram_bot.service.ai_response_cache import AIResponseCache, AIResponseCacheConfig
+from telegram_bot.service.db_service import MessageEntry, MessageType
+
+
+def _make_service(route: QueryRoute, response_cache: AIResponseCache | None = None) -> AIAssistantService:
+    bot_settings = MagicMock()
+    bot_settings.ai_assistant.max_turns = 25
+    bot_settings.ai_assistant.last_n_messages = 5
+    db_service = MagicMock()
+    # Every exchange is logged, so the conversation prefix differs between consecutive queries
+    logged: list[MessageEntry] = []
+    db_service.add_message_entry.side_effect = logged.append
+    db_service.list_message_logs.side_effect = lambda user_id, limit: list(reversed(logged))[:limit]
+    query_router = MagicMock()
+    query_router.route = AsyncMock(return_value=route)
+
+    service = AIAssistantService(
+        db_service=db_service,
+        bot_settings=bot_settings,
+        obsidian_daily_notes_manager=MagicMock(),
+        life_context_service=MagicMock(),
+        obsidian_embedding_indexer=MagicMock(),
+        embedding_function=lambda texts: [[1.0, 0.0] for _ in texts],
+        response_cache=response_cache,
+        query_router=query_router,
+    )
+    service.ai_assistant_agent = MagicMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_query_exceeding_routed_budget_is_retried_with_default_budget():
+    service = _make_service(QueryRoute(kind=QueryKind.CHAT, similarity=0.9, max_turns=2))
+    service._run = AsyncMock(side_effect=[MaxTurnsExceeded("Max turns (2) exceeded"), MagicMock(final_output="Hej!")])
+
+    assert await service.run_ai_assistant(user_id=1, query="cześć") == "Hej!"
+    assert [call.args[2] for call in service._run.await_args_list] == [2, 25]
+
+
+@pytest.mark.asyncio
+async def test_query_exceeding_default_budget_is_not_retried():
+    service = _make_service(QueryRoute(kind=None, similarity=0.1, max_turns=25))
+    service._run = AsyncMock(side_effect=MaxTurnsExceeded("Max turns (25) exceeded"))
+
+    with pytest.raises(MaxTurnsExceeded):
+        await service.run_ai_assistant(user_id=1, query="cześć")
+    assert service._run.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_cacheable_question_is_answered_from_cache():
+    route = QueryRoute(kind=QueryKind.QUESTION, similarity=0.9, max_turns=8, cacheable=True)
+    service = _make_service(route, AIResponseCache(AIResponseCacheConfig()))
+    service._run = AsyncMock(return_value=MagicMock(final_output="Spałeś 7h", new_items=[]))
+
+    first = await service.run_ai_assistant(user_id=1, query="jak spałem?")
+    second = await service.run_ai_assistant(user_id=1, query="jak spałem?")
+
+    assert first == second == "Spałeś 7h"
+    assert service._run.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_chat_reply_is_never_cached():
+    route = QueryRoute(kind=QueryKind.CHAT, similarity=0.9, max_turns=2)
+    service = _make_service(route, AIResponseCache(AIResponseCacheConfig()))
+    service._run = AsyncMock(return_value=MagicMock(final_output="Zrobione", new_items=[]))
+
+    await service.run_ai_assistant(user_id=1, query="tak")
+    await service.run_ai_assistant(user_id=1, query="tak")
+
+    assert service._run.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_nocache_tag_is_stripped_and_skips_cache():
+    route = QueryRoute(kind=QueryKind.QUESTION, similarity=0.9, max_turns=8, cacheable=True)
+    service = _make_service(route, AIResponseCache(AIResponseCacheConfig()))
+    service._run = AsyncMock(return_value=MagicMock(final_output="Spałeś 7h", new_items=[]))
+
+    await service.run_ai_assistant(user_id=1, query="jak spałem? #nocache")
+    await service.run_ai_assistant(user_id=1, query="jak spałem? #nocache")
+
+    assert service._run.await_count == 2
+    assert "#nocache" not in service._run.await_args.args[1]
+    logged_entry = service.db_service.add_message_entry.call_args.args[0]
+    assert logged_entry.content == "jak spałem?"
+    assert logged_entry.message_type is MessageType.TEXT
+
+
+@pytest.mark.asyncio
+async def test_routing_uses_routing_text_instead_of_wrapped_query():
+    route = QueryRoute(kind=QueryKind.QUESTION, similarity=0.9, max_turns=8, cacheable=True)
+    service = _make_service(route, AIResponseCache(AIResponseCacheConfig()))
+    service.embedding_function = MagicMock(return_value=[[1.0, 0.0]])
+    service._run = AsyncMock(return_value=MagicMock(final_output="Spałeś 7h", new_items=[]))
+
+    await service.run_ai_assistant(user_id=1, query="[VOICE] jak spałem? [/VOICE]", routing_text="jak spałem?")
+
+    service.embedding_function.assert_called_once_with(["jak spałem?"])
+    assert "[VOICE] jak spałem? [/VOICE]" in service._run.await_args.args[1]
+
+
+@pytest.mark.asyncio
+async def test_direct_note_saves_only_the_routing_text():
+    service = _make_service(QueryRoute(kind=QueryKind.NOTE, similarity=0.95, max_turns=3, direct=True))
+    service.obsidian_daily_notes_manager.log_daily_note = AsyncMock(return_value="kup mleko")
+    service._run = AsyncMock()
+
+    await service.run_ai_assistant(user_id=1, query="[VOICE] kup mleko [/VOICE]", routing_text="kup mleko")
+
+    service.obsidian_daily_notes_manager.log_daily_note.assert_awaited_once_with("kup mleko")
+    service._run.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_retried_query_is_not_cached():
+    route = QueryRoute(kind=QueryKind.QUESTION, similarity=0.9, max_turns=8, cacheable=True)
+    service = _make_service(route, AIResponseCache(AIResponseCacheConfig()))
+    answer = MagicMock(final_output="Spałeś 7h", new_items=[])
+    service._run = AsyncMock(side_effect=[MaxTurnsExceeded("Max turns (8) exceeded"), answer, answer])
+
+    await service.run_ai_assistant(user_id=1, query="jak spałem?")
+    await service.run_ai_assistant(user_id=1, query="jak spałem?")
+
+    assert service._run.await_count == 3
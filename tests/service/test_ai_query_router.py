@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from telegram_bot.service.ai_query_router import QueryKind, QueryRouter, QueryRouterConfig
+
+_CONFIG = QueryRouterConfig(
+    templates={
+        QueryKind.NOTE: ["kup mleko"],
+        QueryKind.QUESTION: ["jak spałem?"],
+    },
+)
+
+
+def fake_embedding_function(texts):
+    vectors = {"kup mleko": [1.0, 0.0, 0.0], "jak spałem?": [0.0, 1.0, 0.0]}
+    return [vectors[text] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_close_note_is_routed_directly():
+    router = QueryRouter(_CONFIG, fake_embedding_function, default_max_turns=25)
+
+    route = await router.route(np.asarray([0.95, 0.312, 0.0], dtype=np.float32))
+
+    assert route.kind is QueryKind.NOTE
+    assert route.direct
+    assert route.max_turns == 3
+    assert not route.cacheable
+
+
+@pytest.mark.asyncio
+async def test_note_close_to_another_kind_is_not_routed_directly():
+    config = QueryRouterConfig(
+        templates={
+            QueryKind.NOTE: ["kup mleko"],
+            QueryKind.QUESTION: ["czy kupiłem mleko?"],
+        },
+    )
+
+    def embedding_function(texts):
+        vectors = {"kup mleko": [1.0, 0.0], "czy kupiłem mleko?": [0.8, 0.6]}
+        return [vectors[text] for text in texts]
+
+    router = QueryRouter(config, embedding_function, default_max_turns=25)
+
+    route = await router.route(np.asarray([0.95, 0.312], dtype=np.float32))
+
+    assert route.kind is QueryKind.NOTE
+    assert not route.direct
+
+
+@pytest.mark.asyncio
+async def test_question_gets_its_turn_budget():
+    router = QueryRouter(_CONFIG, fake_embedding_function, default_max_turns=25)
+
+    route = await router.route(np.asarray([0.6, 0.8, 0.0], dtype=np.float32))
+
+    assert route.kind is QueryKind.QUESTION
+    assert not route.direct
+    assert route.max_turns == 8
+    assert route.cacheable
+
+
+@pytest.mark.asyncio
+async def test_unmatched_query_keeps_default_budget():
+    router = QueryRouter(_CONFIG, fake_embedding_function, default_max_turns=25)
+
+    route = await router.route(np.asarray([0.0, 0.0, 1.0], dtype=np.float32))
+
+    assert route.kind is None
+    assert route.max_turns == 25
+
+
+@pytest.mark.asyncio
+async def test_confident_obsidian_query_skips_primary_assistant():
+    config = QueryRouterConfig(
+        templates={
+            QueryKind.QUESTION: ["jak spałem?"],
+            QueryKind.OBSIDIAN: ["co pisałem o projekcie Phoenix?"],
+        },
+    )
+
+    def embedding_function(texts):
+        vectors = {"jak spałem?": [1.0, 0.0], "co pisałem o projekcie Phoenix?": [0.0, 1.0]}
+        return [vectors[text] for text in texts]
+
+    router = QueryRouter(config, embedding_function, default_max_turns=25)
+
+    confident = await router.route(np.asarray([0.1, 0.995], dtype=np.float32))
+    ambiguous = await router.route(np.asarray([0.6, 0.8], dtype=np.float32))
+
+    assert confident.kind is QueryKind.OBSIDIAN
+    assert confident.direct
+    assert ambiguous.kind is QueryKind.OBSIDIAN
+    assert not ambiguous.direct
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+
+from telegram_bot.service.ai_response_cache import AIResponseCache, AIResponseCacheConfig
+
+_TODAY = date(2025, 1, 15)
+
+
+def test_similar_query_hits_cache():
+    cache = AIResponseCache(AIResponseCacheConfig())
+    embedding = np.asarray([1.0, 0.0], dtype=np.float32)
+    cache.store(1, _TODAY, embedding, "Dobrze")
+
+    similar = np.asarray([0.99, 0.141], dtype=np.float32)
+    different = np.asarray([0.0, 1.0], dtype=np.float32)
+
+    assert cache.lookup(1, _TODAY, similar) == "Dobrze"
+    assert cache.lookup(1, _TODAY, different) is None
+    assert cache.lookup(2, _TODAY, similar) is None
+
+
+def test_reply_is_not_reused_on_another_day():
+    cache = AIResponseCache(AIResponseCacheConfig())
+    embedding = np.asarray([1.0, 0.0], dtype=np.float32)
+    cache.store(1, _TODAY, embedding, "Wczoraj byłeś na siłowni")
+
+    assert cache.lookup(1, date(2025, 1, 16), embedding) is None
+
+
+def test_expired_entries_are_ignored():
+    cache = AIResponseCache(AIResponseCacheConfig(ttl_seconds=-1.0))
+    embedding = np.asarray([1.0, 0.0], dtype=np.float32)
+    cache.store(1, _TODAY, embedding, "Dobrze")
+
+    assert cache.lookup(1, _TODAY, embedding) is None
+
+
+def test_nocache_tag_bypasses_cache():
+    assert AIResponseCache.is_bypassed("jak spałem? #nocache")
+    assert not AIResponseCache.is_bypassed("jak spałem?")
+    assert AIResponseCache.strip_bypass_tag("jak spałem? #nocache") == "jak spałem?"
@@ -516,3 +516,40 @@ async def test_remote_ref_check_skips_pull_when_unchanged(tmp_path, monkeypatch)
     await service.safe_read_file(repo_path / "test.md")
     assert ls_remote_count > initial_ref_checks, "Should check remote ref again"
     assert pull_count == 1, "Should skip pull when remote unchanged"
+
+
+@pytest.mark.asyncio
+async def test_safe_read_files_uses_single_transaction(tmp_path):
+    """Test that batched reads sync the vault once and preserve input order."""
+    repo_path, _ = _create_git_repo(tmp_path)
+
+    (repo_path / "file1.md").write_text("content1", encoding="utf-8")
+    (repo_path / "file2.md").write_text("content2", encoding="utf-8")
+    _run_git(["add", "."], cwd=repo_path)
+    _run_git(["commit", "-m", "add files"], cwd=repo_path)
+    _run_git(["push"], cwd=repo_path)
+
+    config = ObsidianConfig(
+        obsidian_root_dir=repo_path,
+        daily_notes_dir=Path("daily"),
+        ai_assistant_memory_logs=Path("ai_logs"),
+        persistent_memory_file=Path("persistent_memory.md"),
+        read_cache_ttl=0,
+    )
+
+    service = ObsidianService(config=config)
+
+    fetch_count = 0
+    original_fetch = service._git_fetch
+
+    async def counting_fetch():
+        nonlocal fetch_count
+        fetch_count += 1
+        await original_fetch()
+
+    service._git_fetch = counting_fetch
+
+    contents = await service.safe_read_files(["file2.md", repo_path / "file1.md"])
+
+    assert contents == ["content2", "content1"]
+    assert fetch_count == 1
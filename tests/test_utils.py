@@ -6,11 +6,18 @@ These tests validate the markdown conversion, message formatting,
 and text chunking functionality for Telegram messages.
 """
 
+from types import SimpleNamespace
+
+import pytest
+
 from telegram_bot.utils import (
+    StreamingReply,
     _is_section_header,
     _split_text_into_chunks,
     clean_ai_response,
     convert_markdown_to_telegram,
+    escape_markdown_v1,
+    truncate_snippet,
 )
 
 
@@ -117,6 +124,36 @@ class TestCleanAiResponse:
         assert result == "42"
 
 
+class TestEscapeMarkdownV1:
+    """Tests for escape_markdown_v1 function."""
+
+    def test_escapes_special_characters(self):
+        assert escape_markdown_v1("*bold* _it_ `code` [link]") == "\\*bold\\* \\_it\\_ \\`code\\` \\[link]"
+
+    def test_returns_plain_text_unchanged(self):
+        text = "zwykły tekst bez formatowania"
+        assert escape_markdown_v1(text) is text
+
+    def test_handles_empty_string(self):
+        assert escape_markdown_v1("") == ""
+
+
+class TestTruncateSnippet:
+    """Tests for truncate_snippet function."""
+
+    def test_keeps_short_text_on_one_line(self):
+        assert truncate_snippet("  first line\nsecond\tline \n", 50) == "first line second line"
+
+    def test_truncates_long_text_with_ellipsis(self):
+        assert truncate_snippet("a" * 20, 10) == "a" * 7 + "…"
+
+    def test_trailing_whitespace_past_limit_does_not_truncate(self):
+        assert truncate_snippet("\n" * 30 + "a" * 10 + " " * 30, 10) == "a" * 10
+
+    def test_whitespace_run_at_limit_keeps_ellipsis(self):
+        assert truncate_snippet("a" * 5 + " " * 40 + "b", 10) == "a" * 5 + "…"
+
+
 class TestIsSectionHeader:
     """Tests for _is_section_header function."""
 
@@ -283,3 +320,56 @@ Wygląda na to, że spałeś dobrze!"""
                 for j, line in enumerate(lines[:5]):  # Check first 5 lines
                     if "*Section" in line:
                         assert j <= 2  # Should be in first few lines
+
+
+class FakeBot:
+    """Records the Telegram calls made by StreamingReply."""
+
+    def __init__(self):
+        self.sent: list[str] = []
+        self.edits: list[tuple[str, str | None]] = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.sent.append(text)
+        return SimpleNamespace(message_id=42)
+
+    async def edit_message_text(self, text, chat_id, message_id, parse_mode=None):
+        self.edits.append((text, parse_mode))
+
+
+class TestStreamingReply:
+    """Tests for the progressively edited AI reply message."""
+
+    @pytest.mark.asyncio
+    async def test_throttles_partial_edits(self):
+        """Only the first delta within an edit interval triggers an edit."""
+        bot = FakeBot()
+        reply = await StreamingReply.start(bot, chat_id=1)
+
+        await reply.append("Hello")
+        await reply.append(" world")
+
+        assert bot.sent == [StreamingReply.PLACEHOLDER]
+        assert bot.edits == [("Hello", None)]
+
+    @pytest.mark.asyncio
+    async def test_finish_replaces_placeholder_and_sends_overflow(self):
+        """The final text is edited into the placeholder and overflow chunks are sent as new messages."""
+        bot = FakeBot()
+        reply = StreamingReply(bot, chat_id=1, message_id=42, max_length=40)
+
+        await reply.finish("x" * 30 + "\n" + "y" * 30)
+
+        assert bot.edits == [("x" * 30, "Markdown")]
+        assert bot.sent == ["y" * 30]
+
+    @pytest.mark.asyncio
+    async def test_fail_replaces_partial_reply_with_failure_notice(self):
+        """A failed run leaves a failure notice instead of the placeholder or a truncated reply."""
+        bot = FakeBot()
+        reply = await StreamingReply.start(bot, chat_id=1)
+        await reply.append("Partial")
+
+        await reply.fail()
+
+        assert bot.edits == [("Partial", None), (StreamingReply.FAILURE_TEXT, None)]